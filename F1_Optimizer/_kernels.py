@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels for the Formula 1 lineup optimizer.
+
+These functions work on plain NumPy arrays (one array per player attribute) and are
+compiled with Numba when it is installed. Without Numba they run as regular Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; run the kernels as plain Python instead
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def greedy_pick(order, salary_order, salary, pos_id, team_id, name_id, open_mask, needed,
+                cnstr_pos, cap, max_from_team, prev_members, max_overlap):
+    """
+    Greedily fill a lineup, taking players in the given order.
+
+    A player is skipped if it would break the position quotas, the max-from-team limit,
+    the CPT/D pairing rule, the allowed overlap with a previous lineup, or the salary cap
+    (keeping enough room to fill the remaining slots with the cheapest open players).
+
+    Args:
+        order: Player indices in the order they should be considered
+        salary_order: Player indices sorted by ascending salary
+        salary: Salary of each player
+        pos_id: Position code of each player (index into needed, -1 if not a roster slot)
+        team_id: Team code of each player
+        name_id: Name code of each player
+        open_mask: True for players that may be selected
+        needed: Number of players required for each position code
+        cnstr_pos: Position code of the constructor slot
+        cap: Salary cap
+        max_from_team: Maximum number of drivers from one team
+        prev_members: (num_previous_lineups, num_players) array, 1 where a player was in that lineup
+        max_overlap: Maximum number of shared players allowed with each previous lineup
+
+    Returns:
+        int8 array with 1 for each selected player, all zeros if no complete lineup was found
+    """
+    n = salary.shape[0]
+    picks = np.zeros(n, dtype=np.int8)
+    is_open = open_mask.copy()
+    remaining = needed.copy()
+    team_counts = np.zeros(team_id.max() + 1, dtype=np.int64)
+    overlaps = np.zeros(prev_members.shape[0], dtype=np.int64)
+    salary_used = 0
+
+    for k in range(order.shape[0]):
+        idx = order[k]
+        pos = pos_id[idx]
+        if not is_open[idx] or pos < 0 or remaining[pos] == 0:
+            continue
+        is_driver = pos != cnstr_pos
+        if is_driver and team_counts[team_id[idx]] >= max_from_team:
+            continue
+
+        diverse = True
+        for p in range(prev_members.shape[0]):
+            if overlaps[p] + prev_members[p, idx] > max_overlap[p]:
+                diverse = False
+                break
+        if not diverse:
+            continue
+
+        # Cheapest way to fill the slots left after taking this player
+        remaining[pos] -= 1
+        reserve = 0
+        for slot in range(remaining.shape[0]):
+            count = remaining[slot]
+            for k2 in range(salary_order.shape[0]):
+                if count == 0:
+                    break
+                j = salary_order[k2]
+                if pos_id[j] != slot or not is_open[j] or j == idx:
+                    continue
+                if is_driver and pos_id[j] != cnstr_pos and name_id[j] == name_id[idx]:
+                    continue
+                reserve += salary[j]
+                count -= 1
+            if count > 0:
+                reserve = cap + 1
+                break
+        if salary_used + salary[idx] + reserve > cap:
+            remaining[pos] += 1
+            continue
+
+        picks[idx] = 1
+        salary_used += salary[idx]
+        is_open[idx] = False
+        for p in range(prev_members.shape[0]):
+            overlaps[p] += prev_members[p, idx]
+        if is_driver:
+            team_counts[team_id[idx]] += 1
+            for j in range(n):
+                if pos_id[j] != cnstr_pos and name_id[j] == name_id[idx]:
+                    is_open[j] = False
+
+    for slot in range(remaining.shape[0]):
+        if remaining[slot] > 0:
+            return np.zeros(n, dtype=np.int8)
+    return picks
+
+
+@njit(cache=True)
+def assemble_lineup(selected, pos_id, salary, points):
+    """
+    Order a lineup's players and total its salary and points.
+    
+    Players are ordered by position code, then by points (highest first); players with
+    equal keys keep their selection order.
+    
+    Args:
+        selected: Indices of the selected players
+        pos_id: Position code of each player (its rank in the lineup order)
+        salary: Salary of each player
+        points: Points of each player
+        
+    Returns:
+        Tuple of the ordered player indices, the total salary and the total points
+    """
+    n = selected.shape[0]
+    total_salary = 0
+    total_points = 0.0
+    for k in range(n):
+        total_salary += salary[selected[k]]
+        total_points += points[selected[k]]
+    
+    # Insertion sort: a lineup only has a handful of players
+    order = selected.copy()
+    for i in range(1, n):
+        idx = order[i]
+        j = i - 1
+        while j >= 0 and (pos_id[order[j]] > pos_id[idx] or
+                          (pos_id[order[j]] == pos_id[idx] and points[order[j]] < points[idx])):
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = idx
+    return order, total_salary, total_points
+
+
+@njit(cache=True)
+def shared_player_counts(lineup_bits, bits):
+    """
+    Count the players each lineup shares with one lineup, using 64-bit player bitsets.
+    
+    Args:
+        lineup_bits: uint64 bitset of each lineup (bit i is set if player i is in the lineup)
+        bits: uint64 bitset of the lineup to compare against
+        
+    Returns:
+        int64 array with the number of shared players for each lineup
+    """
+    # Popcount of the common bits (SWAR: sum bit counts in 2, 4, then 8-bit fields)
+    x = lineup_bits & bits
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
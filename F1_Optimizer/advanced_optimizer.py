@@ -8,34 +8,117 @@ with customizable diversity.
 """
 
 import os
+import sys
+import functools
 import csv
+import numpy as np
 import pandas as pd
 import pulp as plp
-from typing import List, Dict, Tuple, Set, Optional
-from collections import defaultdict
+from typing import List, Dict, Tuple, Set, Optional, Union
+from collections import Counter
+from itertools import combinations
 import argparse
 from datetime import datetime
 
+from _kernels import greedy_pick, shared_player_counts
+
+try:
+    import pyarrow  # noqa: F401 (optional; lets pandas use its multithreaded CSV reader)
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+def _prepare_players(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert raw player data to the types and derived columns the optimizer uses.
+    
+    Args:
+        df: Player data with the CSV's columns (modified in place)
+        
+    Returns:
+        The prepared DataFrame
+    """
+    # Ensure we use the correct data types
+    df['Salary'] = df['Salary'].astype(int)
+    df['AvgPointsPerGame'] = df['AvgPointsPerGame'].astype(float)
+    
+    # Repeated string columns as categoricals: comparisons work on integer codes
+    for column in ('Roster Position', 'TeamAbbrev', 'Name', 'Game Info'):
+        df[column] = df[column].astype('category')
+    
+    # Calculate Captain points (1.5x the regular points)
+    df['CaptainPoints'] = df['AvgPointsPerGame'].to_numpy() * 1.5
+    
+    # Points a player actually scores in their roster slot (captain multiplier applied)
+    df['EffectivePoints'] = np.where(df['Roster Position'] == 'CPT', df['CaptainPoints'], df['AvgPointsPerGame'])
+    
+    # Add a unique ID column if needed
+    if 'ID' not in df.columns:
+        df['ID'] = df.index
+        
+    return df
+
+
+@functools.lru_cache(maxsize=8)
+def _load_players_cached(csv_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Read and prepare a player CSV, caching the result per file version.
+    
+    The modification time and size are part of the cache key, so an edited file is read again.
+    
+    Args:
+        csv_path: Path to the CSV file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+        
+    Returns:
+        Prepared DataFrame (shared; copy before modifying)
+    """
+    return _prepare_players(pd.read_csv(csv_path, engine=CSV_ENGINE))
+
 
 class AdvancedLineupOptimizer:
     """Advanced class for optimizing Daily Fantasy Formula 1 lineups with additional features."""
 
+    # Slates with fewer players than this can be solved by listing every valid lineup
+    # instead of solving one MIP per lineup, when optimize() is asked to (at most 64:
+    # listed lineups are stored as 64-bit player bitsets)
+    ENUMERATION_MAX_PLAYERS = 40
+    
+    # Templates for display_lineups
+    LINEUP_HEADER_TEMPLATE = (
+        "\n" + "=" * 80 + "\n"
+        "LINEUP #{number} - Total Points: {total_points:.2f} - "
+        "Total Salary: ${total_salary} - Teams Used: {teams_used}\n"
+        + "-" * 80 + "\n"
+        + f"{'POS':<6}{'NAME':<30}{'TEAM':<8}{'SALARY':<10}{'POINTS':<10}{'GAME INFO':<20}\n"
+        + "-" * 80
+    )
+    PLAYER_ROW_TEMPLATE = "{position:<6}{name:<30}{team:<8}${salary:<9}{points:<10.2f}{game_info:<20}"
+
     def __init__(
         self, 
-        csv_path: str, 
+        csv_path: Union[str, pd.DataFrame], 
         salary_cap: int = 50000,
         max_from_team: int = 3,
         min_teams: int = 2,
-        max_player_appearances: int = 1
+        max_player_appearances: int = 1,
+        solver_name: str = 'HiGHS',
+        time_limit: Optional[int] = None,
+        solver: Optional[plp.LpSolver] = None
     ):
         """
         Initialize the lineup optimizer with driver/constructor data and constraints.
         
         Args:
-            csv_path: Path to the CSV file containing player data
+            csv_path: Path to the CSV file containing player data, or a DataFrame with the same columns
             salary_cap: Maximum salary allowed for the roster (default: $50,000)
             max_from_team: Maximum number of drivers allowed from a single team
             min_teams: Minimum number of different teams that must be represented in a lineup
+            solver_name: MIP solver to use ('HiGHS' or 'CBC'); falls back to CBC if HiGHS is unavailable
+            time_limit: Optional time limit in seconds for each lineup solve
+            solver: Preconfigured PuLP solver to use instead of the one chosen by solver_name
         """
         self.salary_cap = salary_cap
         self.max_from_team = max_from_team
@@ -43,6 +126,10 @@ class AdvancedLineupOptimizer:
         self.players_df = self._load_data(csv_path)
         self.teams = self.players_df['TeamAbbrev'].unique().tolist()
         self.max_player_appearances = max_player_appearances
+        self.solver_name = solver_name
+        self.time_limit = time_limit
+        self.solver = solver
+        self._output_dir = None
         
         # Required positions for a valid lineup
         self.required_positions = {
@@ -50,30 +137,233 @@ class AdvancedLineupOptimizer:
             'D': 4,    # Drivers
             'CNSTR': 1 # Constructor
         }
+        
+        # Player attributes as NumPy arrays, one per column, for the model build and the
+        # numeric kernels. Positions, teams and names are stored as integer codes.
+        positions = self.players_df['Roster Position'].to_numpy()
+        self._pos_names = list(self.required_positions)
+        position_codes = {position: code for code, position in enumerate(self._pos_names)}
+        self._ids = self.players_df['ID'].to_numpy()
+        self._salaries = self.players_df['Salary'].to_numpy(dtype=np.int64)
+        self._points = self.players_df['EffectivePoints'].to_numpy()
+        self._pos_codes = np.array([position_codes.get(position, -1) for position in positions], dtype=np.int64)
+        self._team_codes = self.players_df['TeamAbbrev'].cat.codes.to_numpy(dtype=np.int64)
+        self._team_names = self.players_df['TeamAbbrev'].cat.categories.tolist()
+        self._name_codes = self.players_df['Name'].cat.codes.to_numpy(dtype=np.int64)
+        
+        # Lower bound on the salary of any valid lineup: the cheapest players for each slot
+        self._min_possible_salary = int(sum(
+            np.sort(self._salaries[self._pos_codes == code])[:count].sum()
+            for code, count in enumerate(self.required_positions.values())
+        ))
+        
+        # Player rows keyed by ID for O(1) lookups when building lineup output
+        self._player_by_id = {row['ID']: row for row in self.players_df.to_dict('records')}
+        self._row_by_id = {player_id: row for row, player_id in enumerate(self._ids.tolist())}
+        
+        # Driver IDs (CPT and D versions, no constructors) for each team that has drivers
+        is_driver = self._pos_codes != position_codes['CNSTR']
+        self._team_driver_ids = {self._team_names[code]: self._ids[is_driver & (self._team_codes == code)].tolist()
+                                 for code in np.unique(self._team_codes[is_driver])}
+        
+        # ID groups for drivers listed in more than one slot (CPT and D versions of the same driver)
+        name_codes, name_counts = np.unique(self._name_codes[is_driver], return_counts=True)
+        self._driver_id_pairs = [self._ids[is_driver & (self._name_codes == code)].tolist()
+                                 for code in name_codes[name_counts > 1]]
 
-    def _load_data(self, csv_path: str) -> pd.DataFrame:
+    def _load_data(self, csv_path: Union[str, pd.DataFrame]) -> pd.DataFrame:
         """
         Load driver/constructor data from CSV file.
         
         Args:
-            csv_path: Path to the CSV file
+            csv_path: Path to the CSV file, or a DataFrame with the CSV's columns (not modified)
             
         Returns:
             DataFrame containing player information
         """
-        df = pd.read_csv(csv_path)
-        # Ensure we use the correct data types
-        df['Salary'] = df['Salary'].astype(int)
-        df['AvgPointsPerGame'] = df['AvgPointsPerGame'].astype(float)
+        if isinstance(csv_path, pd.DataFrame):
+            return _prepare_players(csv_path.copy())
+        
+        # Repeated constructions from the same file reuse the parsed and prepared data
+        stat = os.stat(csv_path)
+        return _load_players_cached(os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size).copy()
+
+    def _make_solver(self, threads: Optional[int] = None, mip_start: bool = False) -> plp.LpSolver:
+        """
+        Create the solver used for each lineup solve.
+        
+        Uses the solver passed to the constructor if there is one (and it takes MIP starts,
+        when mip_start is set). Otherwise prefers
+        HiGHS (the in-process highspy binding, then the command-line binary)
+        and falls back to the CBC solver bundled with PuLP when HiGHS isn't installed.
+        The command-line solvers are created with warmStart so that each solve starts
+        from the current variable values (the greedy seed or previous lineup) as a MIP start,
+        and run their branch and bound on several threads.
+        
+        Args:
+            threads: Number of solver threads (default: all CPUs but one)
+            mip_start: Skip the in-process HiGHS binding, for solves that need a MIP start
+        
+        Returns:
+            A configured PuLP solver instance
+        """
+        if self.solver is not None and (not mip_start or self.solver.optionsDict.get('warmStart', False)):
+            return self.solver
+        
+        if threads is None:
+            threads = max(1, (os.cpu_count() or 1) - 1)
+        
+        if self.solver_name.lower() == 'highs':
+            highs_solvers = []
+            if hasattr(plp, 'HiGHS') and not mip_start:
+                # PuLP's highspy binding doesn't take MIP starts
+                highs_solvers.append(plp.HiGHS(msg=False, timeLimit=self.time_limit, gapRel=0))
+            if hasattr(plp, 'HiGHS_CMD'):
+                highs_solvers.append(plp.HiGHS_CMD(msg=False, timeLimit=self.time_limit, gapRel=0, 
+                                                   threads=threads, warmStart=True))
+            for solver in highs_solvers:
+                if solver.available():
+                    return solver
+        
+        return plp.PULP_CBC_CMD(msg=False, timeLimit=self.time_limit, gapRel=0, warmStart=True,
+                                threads=threads, presolve=True, options=['-preprocess', 'equal'])
+
+    def _greedy_lineup(
+        self,
+        excluded_ids: Set[int] = frozenset(),
+        previous_lineups: List[List[int]] = (),
+        lineup_diversity: int = 0
+    ) -> Set[int]:
+        """
+        Build a quick heuristic lineup used to seed the MIP solver.
+        
+        Players are taken in order of projected points, skipping any pick that would break
+        the position quotas, the max-from-team limit, the CPT/D pairing rule, the diversity
+        requirement against previous lineups, or the salary cap (keeping enough room to fill
+        the remaining slots with the cheapest available players). The selection itself runs
+        in the greedy_pick kernel, which is JIT-compiled when Numba is installed.
+        
+        Args:
+            excluded_ids: IDs of players that can't be selected
+            previous_lineups: Player IDs of the lineups generated so far
+            lineup_diversity: Minimum number of different players between lineups
+            
+        Returns:
+            Set of selected player IDs, or an empty set if no complete lineup was found
+        """
+        open_mask = ~np.isin(self._ids, list(excluded_ids))
+        prev_members = np.zeros((len(previous_lineups), len(self._ids)), dtype=np.int8)
+        for row, prev_lineup in enumerate(previous_lineups):
+            prev_members[row] = np.isin(self._ids, prev_lineup)
+        max_overlap = np.array([len(prev_lineup) - lineup_diversity for prev_lineup in previous_lineups], 
+                               dtype=np.int64)
+        
+        picks = greedy_pick(
+            np.argsort(-self._points, kind='stable'),
+            np.argsort(self._salaries, kind='stable'),
+            self._salaries,
+            self._pos_codes,
+            self._team_codes,
+            self._name_codes,
+            open_mask,
+            np.array(list(self.required_positions.values()), dtype=np.int64),
+            self._pos_names.index('CNSTR'),
+            self.salary_cap,
+            self.max_from_team,
+            prev_members,
+            max_overlap
+        )
+        return set(self._ids[picks == 1].tolist())
+
+    def _build_model(
+        self,
+        stack_team: Optional[str],
+        stack_count: int,
+        min_salary_used: float
+    ) -> Tuple[plp.LpProblem, Dict[int, plp.LpVariable], Dict[str, plp.LpVariable]]:
+        """
+        Build the lineup model with the objective and all per-lineup constraints.
+        
+        Args:
+            stack_team: Team abbreviation to stack (if desired)
+            stack_count: Number of drivers to include from stacked team
+            min_salary_used: Minimum fraction of salary cap that must be used
+            
+        Returns:
+            Tuple of the problem, the player variables keyed by ID and the team variables
+        """
+        # Pull the static player data from the cached arrays as plain Python numbers;
+        # NumPy scalars don't combine with PuLP variables
+        ids = self._ids.tolist()
+        salaries = self._salaries.tolist()
+        player_points = self._points.tolist()
+        position_to_ids = {position: self._ids[self._pos_codes == code].tolist()
+                           for code, position in enumerate(self._pos_names)}
+        
+        prob = plp.LpProblem("DFS_Lineup", plp.LpMaximize)
+        
+        # Create a binary variable for each player
+        player_vars = {player_id: plp.LpVariable(f"player_{player_id}", cat='Binary') 
+                       for player_id in ids}
+        
+        # Create binary variables for each team (1 if any driver from that team is selected)
+        team_vars = {team: plp.LpVariable(f"team_{team}", cat='Binary') 
+                    for team in self.teams}
+        
+        # Build the coefficient expressions directly from (variable, coefficient) pairs
+        # rather than summing scaled variables term by term with lpSum
+        var_list = [player_vars[player_id] for player_id in ids]
+        salary_expr = plp.LpAffineExpression(list(zip(var_list, salaries)))
         
-        # Calculate Captain points (1.5x the regular points)
-        df['CaptainPoints'] = df['AvgPointsPerGame'] * 1.5
+        # Objective function: Maximize total points
+        # Note: Captain points are 1.5x
+        prob += plp.LpAffineExpression(list(zip(var_list, player_points)))
         
-        # Add a unique ID column if needed
-        if 'ID' not in df.columns:
-            df['ID'] = df.index
+        # Constraint 1: Salary cap
+        prob += salary_expr <= self.salary_cap
+        
+        # Constraint 2: Minimum salary used (skipped when even the cheapest lineup meets it)
+        min_salary = self.salary_cap * min_salary_used
+        if min_salary > self._min_possible_salary:
+            prob += salary_expr >= min_salary
+        
+        # Constraint 3: Position requirements
+        for position, count in self.required_positions.items():
+            prob += plp.lpSum(player_vars[player_id] 
+                             for player_id in position_to_ids[position]) == count
+        
+        # Constraint 4: Total number of roster spots
+        prob += plp.lpSum(player_vars.values()) == sum(self.required_positions.values())
+        
+        # Constraints 5, 6 and 8 all work on the same per-team driver sums, so build
+        # each team's sum once and reuse it
+        for team, driver_ids in self._team_driver_ids.items():
+            team_sum = plp.lpSum(player_vars[player_id] for player_id in driver_ids)
+            
+            # Constraint 5: Team constraints (connect player_vars to team_vars)
+            # If any driver from this team is selected, team_var must be 1
+            for player_id in driver_ids:
+                prob += player_vars[player_id] <= team_vars[team]
+            
+            # If no drivers from this team are selected, team_var must be 0
+            prob += team_sum >= team_vars[team]
             
-        return df
+            # Constraint 6: Maximum drivers from one team
+            prob += team_sum <= self.max_from_team
+            
+            # Constraint 8: Team stacking if requested
+            if team == stack_team:
+                prob += team_sum >= min(stack_count, len(driver_ids))
+        
+        # Constraint 7: Minimum teams represented
+        prob += plp.lpSum(team_vars.values()) >= self.min_teams
+        
+        # Constraint 9: Can't pick both captain and regular versions of same driver
+        for driver_ids in self._driver_id_pairs:
+            # Constraint: Can only choose at most one version of this driver
+            prob += plp.lpSum(player_vars[id] for id in driver_ids) <= 1
+        
+        return prob, player_vars, team_vars
 
     def optimize(
         self, 
@@ -82,7 +372,9 @@ class AdvancedLineupOptimizer:
         stack_count: int = 2,
         min_salary_used: float = 0.95,
         lineup_diversity: int = 2,
-        max_player_appearances: Optional[int] = None
+        max_player_appearances: Optional[int] = None,
+        initial_lineup: Optional[List[int]] = None,
+        use_enumeration: bool = False
     ) -> List[Dict]:
         """
         Generate optimized lineups with advanced constraints.
@@ -94,115 +386,73 @@ class AdvancedLineupOptimizer:
             min_salary_used: Minimum fraction of salary cap that must be used
             lineup_diversity: Minimum number of different players between lineups
             max_player_appearances: Maximum number of times a player can appear across all lineups
+            initial_lineup: Player IDs of a known lineup (e.g. the basic optimizer's best lineup),
+                used instead of the greedy seed as the MIP start for the first lineup. The solver
+                ignores it if it breaks one of the advanced constraints.
+            use_enumeration: List every valid lineup instead of solving the MIP when the slate
+                has fewer than ENUMERATION_MAX_PLAYERS players. The lineups are the same (up to
+                ties); initial_lineup isn't needed then, as no solver is called.
             
         Returns:
             List of dictionaries, each containing a lineup with player details
         """
+        if use_enumeration and len(self.players_df) < self.ENUMERATION_MAX_PLAYERS:
+            return self._enumerate_optimize(num_lineups, stack_team, stack_count, min_salary_used,
+                                            lineup_diversity, max_player_appearances)
+        
         lineups = []
-        previous_lineups_players = []
         
         # Keep track of how many times each player appears across lineups
-        player_appearances = {player_id: 0 for player_id in self.players_df['ID'].values}
+        player_appearances = {player_id: 0 for player_id in self._ids.tolist()}
+        
+        # Build the model once; only the appearance fixings and diversity cuts
+        # change between lineups, so those are applied to it in the loop below
+        prob, player_vars, team_vars = self._build_model(stack_team, stack_count, min_salary_used)
+        
+        solver = self._make_solver()
+        # Only solvers created with warmStart pass the seed on as a MIP start (the
+        # in-process HiGHS binding doesn't), so the greedy seed is skipped for the others
+        use_greedy_seed = solver.optionsDict.get('warmStart', False)
+        # The initial lineup is only passed on as a MIP start, so the first solve
+        # goes to a solver that takes one
+        first_solver = solver if use_greedy_seed or not initial_lineup else self._make_solver(mip_start=True)
+        previous_lineups = []
+        excluded_ids = set()
         
         for i in range(num_lineups):
-            # Create a new linear programming problem
-            prob = plp.LpProblem(f"DFS_Lineup_{i+1}", plp.LpMaximize)
-            
-            # Create a binary variable for each player
-            player_vars = {row['ID']: plp.LpVariable(f"player_{row['ID']}", cat='Binary') 
-                           for _, row in self.players_df.iterrows()}
-            
-            # Create binary variables for each team (1 if any driver from that team is selected)
-            team_vars = {team: plp.LpVariable(f"team_{team}", cat='Binary') 
-                        for team in self.teams}
-            
-            # Objective function: Maximize total points
-            # Note: Captain points are 1.5x
-            prob += plp.lpSum(
-                row['CaptainPoints'] * player_vars[row['ID']] if row['Roster Position'] == 'CPT' 
-                else row['AvgPointsPerGame'] * player_vars[row['ID']]
-                for _, row in self.players_df.iterrows()
-            )
-            
-            # Constraint 1: Salary cap
-            prob += plp.lpSum(row['Salary'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows()) <= self.salary_cap
-            
-            # Constraint 2: Minimum salary used
-            prob += plp.lpSum(row['Salary'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows()) >= self.salary_cap * min_salary_used
-            
-            # Constraint 3: Position requirements
-            for position, count in self.required_positions.items():
-                prob += plp.lpSum(player_vars[row['ID']] 
-                                 for _, row in self.players_df.iterrows() 
-                                 if row['Roster Position'] == position) == count
-            
-            # Constraint 4: Total number of roster spots
-            prob += plp.lpSum(player_vars.values()) == sum(self.required_positions.values())
-            
-            # Constraint 5: Team constraints (connect player_vars to team_vars)
-            for team in self.teams:
-                # If any driver from this team is selected, team_var must be 1
-                team_players = self.players_df[(self.players_df['TeamAbbrev'] == team) & 
-                                             (self.players_df['Roster Position'] != 'CNSTR')]
-                
-                if not team_players.empty:  # Only add constraints if there are drivers for this team
-                    for _, player in team_players.iterrows():
-                        prob += player_vars[player['ID']] <= team_vars[team]
-                    
-                    # If no drivers from this team are selected, team_var must be 0
-                    prob += plp.lpSum(player_vars[player['ID']] for _, player in team_players.iterrows()) >= team_vars[team]
-            
-            # Constraint 6: Maximum drivers from one team
-            for team in self.teams:
-                team_players = self.players_df[(self.players_df['TeamAbbrev'] == team) & 
-                                             (self.players_df['Roster Position'] != 'CNSTR')]
-                
-                if not team_players.empty:  # Only add constraints if there are drivers for this team
-                    prob += plp.lpSum(player_vars[player['ID']] for _, player in team_players.iterrows()) <= self.max_from_team
-            
-            # Constraint 7: Minimum teams represented
-            prob += plp.lpSum(team_vars.values()) >= self.min_teams
-            
-            # Constraint 8: Team stacking if requested
-            if stack_team and stack_team in self.teams:
-                stack_team_players = self.players_df[(self.players_df['TeamAbbrev'] == stack_team) & 
-                                                  (self.players_df['Roster Position'] != 'CNSTR')]
-                
-                if not stack_team_players.empty:  # Only add constraints if there are drivers for this team
-                    prob += plp.lpSum(player_vars[player['ID']] for _, player in stack_team_players.iterrows()) >= min(stack_count, len(stack_team_players))
-            
-            # Constraint 9: Can't pick both captain and regular versions of same driver
-            driver_names = self.players_df[self.players_df['Roster Position'] != 'CNSTR']['Name'].unique()
-            
-            for driver_name in driver_names:
-                # Get IDs for both versions of this driver (CPT and D)
-                driver_ids = self.players_df[self.players_df['Name'] == driver_name]['ID'].tolist()
-                
-                if len(driver_ids) > 1:  # If driver has both CPT and regular version
-                    # Constraint: Can only choose at most one version of this driver
-                    prob += plp.lpSum(player_vars[id] for id in driver_ids) <= 1
-            
             # Constraint 10: Limit on player appearances across lineups
             if max_player_appearances is not None:
                 excluded_count = 0
                 for player_id, appearances in player_appearances.items():
                     if appearances >= max_player_appearances:
                         # If player has reached maximum allowed appearances, exclude them from this lineup
-                        prob += player_vars[player_id] == 0
+                        player_vars[player_id].upBound = 0
+                        player_vars[player_id].setInitialValue(0)
+                        excluded_ids.add(player_id)
                         excluded_count += 1
                 
                 if excluded_count > 0 and i > 0:  # Only print for second lineup onwards
                     print(f"Lineup {i+1}: Excluded {excluded_count} drivers/constructors who reached the max appearance limit of {max_player_appearances}")
-                        
-            # Constraint 11: Ensure uniqueness from previous lineups
-            for prev_lineup in previous_lineups_players:
-                # New lineup must differ from each previous lineup by at least lineup_diversity players
-                prob += plp.lpSum(player_vars[player_id] for player_id in prev_lineup) <= len(prev_lineup) - lineup_diversity
+            
+            # Seed the solver with the given initial lineup (first lineup only) or a greedy
+            # lineup when one can be found; otherwise the variables keep the previous
+            # lineup's values. Either way the current values are passed as a MIP start,
+            # which the solver discards if it turns out infeasible
+            seed = None
+            if i == 0 and initial_lineup:
+                seed = [player_id for player_id in initial_lineup if player_id in self._player_by_id]
+            elif use_greedy_seed:
+                seed = self._greedy_lineup(excluded_ids, previous_lineups, lineup_diversity)
+            if seed:
+                seed_teams = {self._player_by_id[player_id]['TeamAbbrev'] for player_id in seed
+                              if self._player_by_id[player_id]['Roster Position'] != 'CNSTR'}
+                for player_id, var in player_vars.items():
+                    var.setInitialValue(1 if player_id in seed else 0)
+                for team, var in team_vars.items():
+                    var.setInitialValue(1 if team in seed_teams else 0)
             
             # Solve the problem
-            prob.solve(plp.PULP_CBC_CMD(msg=False))
+            prob.solve(first_solver if i == 0 else solver)
             
             # Check if a solution was found
             if plp.LpStatus[prob.status] != 'Optimal':
@@ -214,54 +464,216 @@ class AdvancedLineupOptimizer:
             # Extract the selected players
             selected_player_ids = [int(p_id) for p_id, var in player_vars.items() 
                                  if plp.value(var) == 1]
-            previous_lineups_players.append(selected_player_ids)
+            previous_lineups.append(selected_player_ids)
+            
+            # Constraint 11: Ensure uniqueness from previous lineups
+            # Next lineup must differ from this one by at least lineup_diversity players
+            # (without diversity the cut can never bind, so it isn't added to the model)
+            if lineup_diversity > 0:
+                prob += plp.lpSum(player_vars[player_id] for player_id in selected_player_ids) <= len(selected_player_ids) - lineup_diversity
             
             # Update player appearance counts
             for player_id in selected_player_ids:
                 player_appearances[player_id] += 1
             
-            # Create lineup data
-            lineup_data = {
-                'players': [],
-                'total_salary': 0,
-                'total_points': 0,
-                'teams_used': set()
-            }
+            lineups.append(self._build_lineup(selected_player_ids))
+        
+        # Sort lineups by total points in descending order
+        lineups.sort(key=lambda x: x['total_points'], reverse=True)
+        return lineups
+
+    def _enumerate_lineups(
+        self,
+        stack_team: Optional[str],
+        stack_count: int,
+        min_salary_used: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        List every lineup that satisfies the per-lineup constraints.
+        
+        Lineups are built as the product of the combinations for each roster slot and then
+        filtered on the salary limits, team limits, minimum teams, stacking and the CPT/D
+        pairing rule, all as vectorized NumPy operations over the whole set.
+        
+        Args:
+            stack_team: Team abbreviation to stack (if desired)
+            stack_count: Number of drivers to include from stacked team
+            min_salary_used: Minimum fraction of salary cap that must be used
             
-            for player_id in selected_player_ids:
-                player = self.players_df[self.players_df['ID'] == player_id].iloc[0]
-                
-                # Calculate points based on position
-                points = player['CaptainPoints'] if player['Roster Position'] == 'CPT' else player['AvgPointsPerGame']
-                
-                lineup_data['players'].append({
-                    'id': player['ID'],
-                    'name': player['Name'],
-                    'position': player['Roster Position'],
-                    'team': player['TeamAbbrev'],
-                    'salary': player['Salary'],
-                    'avg_points': player['AvgPointsPerGame'],  # Base points
-                    'points': points,  # Calculated points (with captain multiplier if applicable)
-                    'game_info': player['Game Info']
-                })
-                
-                lineup_data['total_salary'] += player['Salary']
-                lineup_data['total_points'] += points
+        Returns:
+            Tuple of a (num_lineups, roster_size) array of player indices and the lineup points,
+            sorted by points in descending order
+        """
+        # Every way to fill each slot, then every combination of those slot choices
+        slot_choices = [
+            np.array(list(combinations(np.flatnonzero(self._pos_codes == code), count)), 
+                     dtype=np.int64).reshape(-1, count)
+            for code, count in enumerate(self.required_positions.values())
+        ]
+        grids = np.meshgrid(*[np.arange(len(choices)) for choices in slot_choices], indexing='ij')
+        members = np.hstack([choices[grid.ravel()] for choices, grid in zip(slot_choices, grids)])
+        
+        # Salary cap and minimum salary used
+        salaries = self._salaries[members].sum(axis=1)
+        valid = salaries <= self.salary_cap
+        min_salary = self.salary_cap * min_salary_used
+        if min_salary > self._min_possible_salary:
+            valid &= salaries >= min_salary
+        
+        # Team rules apply to drivers only (the CPT and D slots)
+        column_slots = np.repeat(np.arange(len(self._pos_names)), list(self.required_positions.values()))
+        drivers = members[:, column_slots != self._pos_names.index('CNSTR')]
+        
+        # Drivers from each team in each lineup, counted with one bincount over (lineup, team) pairs
+        num_teams = len(self._team_names)
+        lineup_teams = np.arange(len(members))[:, None] * num_teams + self._team_codes[drivers]
+        team_counts = np.bincount(lineup_teams.ravel(), minlength=len(members) * num_teams).reshape(-1, num_teams)
+        
+        # Maximum drivers from one team
+        valid &= team_counts.max(axis=1, initial=0) <= self.max_from_team
+        
+        # Minimum teams represented; teams without drivers can always be counted, as in the MIP
+        teams_used = (team_counts > 0).sum(axis=1)
+        valid &= teams_used + len(self.teams) - len(self._team_driver_ids) >= self.min_teams
+        
+        # Team stacking if requested
+        if stack_team in self._team_driver_ids:
+            stack_code = self._team_names.index(stack_team)
+            valid &= team_counts[:, stack_code] >= min(stack_count, len(self._team_driver_ids[stack_team]))
+        
+        # Can't pick both captain and regular versions of same driver
+        valid &= (np.diff(np.sort(self._name_codes[drivers], axis=1), axis=1) != 0).all(axis=1)
+        
+        members = members[valid]
+        points = self._points[members].sum(axis=1)
+        order = np.argsort(-points, kind='stable')
+        return members[order], points[order]
+
+    def _enumerate_optimize(
+        self,
+        num_lineups: int,
+        stack_team: Optional[str],
+        stack_count: int,
+        min_salary_used: float,
+        lineup_diversity: int,
+        max_player_appearances: Optional[int]
+    ) -> List[Dict]:
+        """
+        Generate lineups for a small slate by listing every valid lineup.
+        
+        Lineups are taken best first, skipping any that would break the diversity requirement
+        against the lineups already picked or the player appearance limit. This gives the same
+        lineups as solving the MIP once per lineup (up to ties), without calling a solver.
+        As in the MIP path, a lineup can be picked again when there is no diversity requirement.
+        
+        Args:
+            num_lineups: Number of different lineups to generate
+            stack_team: Team abbreviation to stack (if desired)
+            stack_count: Number of drivers to include from stacked team
+            min_salary_used: Minimum fraction of salary cap that must be used
+            lineup_diversity: Minimum number of different players between lineups
+            max_player_appearances: Maximum number of times a player can appear across all lineups
+            
+        Returns:
+            List of dictionaries, each containing a lineup with player details
+        """
+        members, _ = self._enumerate_lineups(stack_team, stack_count, min_salary_used)
+        # Each lineup as a bitset of its players, for counting the players two lineups share
+        lineup_bits = np.bitwise_or.reduce(np.uint64(1) << members.astype(np.uint64), axis=1)
+        available = np.ones(len(members), dtype=bool)
+        appearances = np.zeros(len(self._ids), dtype=np.int64)
+        lineups = []
+        
+        for i in range(num_lineups):
+            # Limit on player appearances across lineups
+            if max_player_appearances is not None:
+                capped = appearances >= max_player_appearances
+                available &= ~capped[members].any(axis=1)
                 
-                # Add team to teams_used if it's a driver (not a constructor)
-                if player['Roster Position'] != 'CNSTR':
-                    lineup_data['teams_used'].add(player['TeamAbbrev'])
+                excluded_count = int(capped.sum())
+                if excluded_count > 0 and i > 0:  # Only print for second lineup onwards
+                    print(f"Lineup {i+1}: Excluded {excluded_count} drivers/constructors who reached the max appearance limit of {max_player_appearances}")
+            
+            candidates = np.flatnonzero(available)
+            if len(candidates) == 0:
+                print(f"Could not find optimal solution for lineup {i+1}")
+                if i == 0:  # First lineup must be successful
+                    return []
+                break
             
-            # Sort players by position in the required order (CPT first, then D, then CNSTR)
-            position_order = {'CPT': 0, 'D': 1, 'CNSTR': 2}
-            lineup_data['players'].sort(key=lambda x: (position_order[x['position']], -x['points']))
+            # Lineups are sorted by points, so the first one left is the best
+            best = candidates[0]
+            selected = members[best]
             
-            lineups.append(lineup_data)
+            # Remaining lineups must differ from this one by at least lineup_diversity players
+            # (with a positive diversity this also rules out picking the same lineup again)
+            available &= shared_player_counts(lineup_bits, lineup_bits[best]) <= len(selected) - lineup_diversity
+            
+            appearances[selected] += 1
+            lineups.append(self._build_lineup(self._ids[selected].tolist()))
         
         # Sort lineups by total points in descending order
         lineups.sort(key=lambda x: x['total_points'], reverse=True)
         return lineups
 
+    def _build_lineup(self, selected_player_ids: List[int]) -> Dict:
+        """
+        Create the lineup dictionary for a set of selected players.
+        
+        Args:
+            selected_player_ids: IDs of the players in the lineup
+            
+        Returns:
+            Dictionary with the lineup's players, total salary, total points and teams used
+        """
+        # by_position holds the player for single slots (CPT, CNSTR) and a list for D,
+        # by_team the number of players from each team
+        lineup_data = {
+            'players': [],
+            'total_salary': 0,
+            'total_points': 0,
+            'teams_used': set(),
+            'by_position': {position: [] if count > 1 else None
+                            for position, count in self.required_positions.items()},
+            'by_team': Counter()
+        }
+        
+        # Order the players by position (CPT first, then D, then CNSTR), then by points
+        rows = np.array([self._row_by_id[player_id] for player_id in selected_player_ids], dtype=np.int64)
+        rows = rows[np.lexsort((-self._points[rows], self._pos_codes[rows]))]
+        
+        for player_id in self._ids[rows].tolist():
+            player = self._player_by_id[player_id]
+            
+            points = player['EffectivePoints']
+            
+            player_data = {
+                'id': player['ID'],
+                'name': player['Name'],
+                'position': player['Roster Position'],
+                'team': player['TeamAbbrev'],
+                'salary': player['Salary'],
+                'avg_points': player['AvgPointsPerGame'],  # Base points
+                'points': points,  # Calculated points (with captain multiplier if applicable)
+                'game_info': player['Game Info']
+            }
+            lineup_data['players'].append(player_data)
+            
+            if self.required_positions[player_data['position']] > 1:
+                lineup_data['by_position'][player_data['position']].append(player_data)
+            else:
+                lineup_data['by_position'][player_data['position']] = player_data
+            lineup_data['by_team'][player_data['team']] += 1
+            
+            lineup_data['total_salary'] += player['Salary']
+            lineup_data['total_points'] += points
+            
+            # Add team to teams_used if it's a driver (not a constructor)
+            if player['Roster Position'] != 'CNSTR':
+                lineup_data['teams_used'].add(player['TeamAbbrev'])
+        
+        return lineup_data
+
     def display_lineups(self, lineups: List[Dict]) -> None:
         """
         Display the optimized lineups in a readable format.
@@ -269,79 +681,116 @@ class AdvancedLineupOptimizer:
         Args:
             lineups: List of lineup dictionaries
         """
+        chunks = []
         for i, lineup in enumerate(lineups, 1):
-            print(f"\n{'='*80}")
-            print(f"LINEUP #{i} - Total Points: {lineup['total_points']:.2f} - "
-                  f"Total Salary: ${lineup['total_salary']} - "
-                  f"Teams Used: {len(lineup['teams_used'])}")
-            print(f"{'-'*80}")
-            print(f"{'POS':<6}{'NAME':<30}{'TEAM':<8}{'SALARY':<10}{'POINTS':<10}{'GAME INFO':<20}")
-            print(f"{'-'*80}")
-            
-            # Group players by team to see stacks
-            team_counts = defaultdict(int)
-            for player in lineup['players']:
-                if player['position'] != 'CNSTR':  # Only count drivers, not constructors
-                    team_counts[player['team']] += 1
+            chunks.append(self.LINEUP_HEADER_TEMPLATE.format_map({
+                'number': i,
+                'total_points': lineup['total_points'],
+                'total_salary': lineup['total_salary'],
+                'teams_used': len(lineup['teams_used'])
+            }))
+            
+            # Group players by team to see stacks (drivers only, not constructors)
+            team_counts = Counter(p['team'] for p in lineup['players'] if p['position'] != 'CNSTR')
             
             for player in lineup['players']:
                 # Highlight teams with multiple drivers
                 team_indicator = f"{player['team']}*" if team_counts[player['team']] > 1 and player['position'] != 'CNSTR' else player['team']
-                print(f"{player['position']:<6}{player['name']:<30}{team_indicator:<8}"
-                      f"${player['salary']:<9}{player['points']:<10.2f}"
-                      f"{player['game_info']:<20}")
+                chunks.append(self.PLAYER_ROW_TEMPLATE.format_map({**player, 'team': team_indicator}))
             
-            print(f"{'='*80}")
+            chunks.append('=' * 80)
+        
+        # Write everything at once instead of one print call per line
+        sys.stdout.write('\n'.join(chunks) + '\n')
             
-    def save_lineups_to_csv(self, lineups: List[Dict], output_file: str = "optimized_lineups.csv") -> None:
+    def _outputs_dir(self) -> str:
         """
-        Save the optimized lineups to a CSV file.
+        Get the Outputs directory, creating it the first time it's needed.
+        
+        Returns:
+            Path to the Outputs directory under the current working directory
+        """
+        if self._output_dir is None:
+            self._output_dir = os.path.join(os.getcwd(), "Outputs")
+            os.makedirs(self._output_dir, exist_ok=True)
+        return self._output_dir
+    
+    def _resolve_output_path(self, output_file: str, timestamp: Optional[str] = None) -> str:
+        """
+        Work out where an output file should be written.
+        
+        A path whose directory already exists is used as-is. Anything else is written to the
+        Outputs directory, with the timestamp added to the filename if it isn't already there.
         
         Args:
-            lineups: List of lineup dictionaries
-            output_file: Path to the output CSV file
+            output_file: Requested output file name or path
+            timestamp: Timestamp to add to the filename (default: the current time)
+            
+        Returns:
+            Path the file should be written to
         """
         # Handle special case when output_file is already a full path with directory
         if os.path.dirname(output_file) and os.path.exists(os.path.dirname(output_file)):
-            output_path = output_file
-        else:
-            # Ensure the Outputs directory exists
-            output_dir = os.path.join(os.getcwd(), "Outputs")
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            
-            # Generate timestamp for unique filenames if not already in the filename
+            return output_file
+        
+        if timestamp is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create output path - if a filename is provided, use it with timestamp
-            base_name = os.path.basename(output_file)
-            name_parts = os.path.splitext(base_name)
-            # Only add timestamp if not already included in the filename
-            if timestamp not in base_name:
-                timestamped_name = f"{name_parts[0]}_{timestamp}{name_parts[1]}"
-                output_path = os.path.join(output_dir, timestamped_name)
-            else:
-                output_path = os.path.join(output_dir, base_name)
         
-        with open(output_path, 'w', newline='') as csvfile:
-            csvwriter = csv.writer(csvfile)
-            csvwriter.writerow(['Lineup', 'Position', 'Name', 'Team', 'Salary', 'Avg Points', 'Game Info'])
-            
-            for i, lineup in enumerate(lineups, 1):
-                for player in lineup['players']:
-                    csvwriter.writerow([
-                        i, 
-                        player['position'], 
-                        player['name'], 
-                        player['team'],
-                        player['salary'], 
-                        player['points'],  # Use calculated points for CSV output
-                        player['game_info']
-                    ])
+        # Only add timestamp if not already included in the filename
+        base_name = os.path.basename(output_file)
+        if timestamp in base_name:
+            return os.path.join(self._outputs_dir(), base_name)
+        
+        name, extension = os.path.splitext(base_name)
+        return os.path.join(self._outputs_dir(), f"{name}_{timestamp}{extension}")
+    
+    def save_lineups_to_csv(
+        self, 
+        lineups: List[Dict], 
+        output_file: str = "optimized_lineups.csv",
+        timestamp: Optional[str] = None
+    ) -> None:
+        """
+        Save the optimized lineups to a CSV file.
+        
+        Args:
+            lineups: List of lineup dictionaries
+            output_file: Path to the output CSV file
+            timestamp: Timestamp to add to generated filenames (default: the current time)
+        """
+        output_path = self._resolve_output_path(output_file, timestamp)
+        
+        # Output columns and the player field each one is filled from
+        # (calculated points are used for the CSV output)
+        fields = {'Position': 'position', 'Name': 'name', 'Team': 'team',
+                  'Salary': 'salary', 'Avg Points': 'points', 'Game Info': 'game_info'}
+        dtypes = {'Salary': np.int64, 'Avg Points': np.float64}
+        
+        # Preallocate one array per column and fill each lineup's rows as a slice
+        num_rows = sum(len(lineup['players']) for lineup in lineups)
+        columns = {'Lineup': np.empty(num_rows, dtype=np.int64)}
+        columns.update((column, np.empty(num_rows, dtype=dtypes.get(column, object))) for column in fields)
+        
+        start = 0
+        for i, lineup in enumerate(lineups, 1):
+            players = lineup['players']
+            rows = slice(start, start + len(players))
+            columns['Lineup'][rows] = i
+            for column, field in fields.items():
+                columns[column][rows] = [player[field] for player in players]
+            start += len(players)
+        
+        # CRLF line endings, as csv.writer produced
+        pd.DataFrame(columns, copy=False).to_csv(output_path, index=False, lineterminator='\r\n')
         
         print(f"\nLineups saved to {output_path}")
         
-    def save_lineup_to_csv(self, lineups: List[Dict], output_file: str = "lineup.csv") -> None:
+    def save_lineup_to_csv(
+        self, 
+        lineups: List[Dict], 
+        output_file: str = "lineup.csv",
+        timestamp: Optional[str] = None
+    ) -> None:
         """
         Save the optimized lineup to a CSV file in position-based format.
         One row per lineup with player IDs in a comma-separated format.
@@ -349,75 +798,57 @@ class AdvancedLineupOptimizer:
         Args:
             lineups: List of lineup dictionaries
             output_file: Path to the output CSV file
+            timestamp: Timestamp to add to generated filenames (default: the current time)
         """
         if not lineups:
             print("No lineups to save.")
             return
         
-        # Handle special case when output_file is already a full path with directory
-        if os.path.dirname(output_file) and os.path.exists(os.path.dirname(output_file)):
-            output_path = output_file
-        else:
-            # Ensure the Outputs directory exists
-            output_dir = os.path.join(os.getcwd(), "Outputs")
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            
-            # Generate timestamp for unique filenames if not already in the filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create output path - if a filename is provided, use it with timestamp
-            base_name = os.path.basename(output_file)
-            name_parts = os.path.splitext(base_name)
-            # Only add timestamp if not already included in the filename
-            if timestamp not in base_name:
-                timestamped_name = f"{name_parts[0]}_{timestamp}{name_parts[1]}"
-                output_path = os.path.join(output_dir, timestamped_name)
-            else:
-                output_path = os.path.join(output_dir, base_name)
+        output_path = self._resolve_output_path(output_file, timestamp)
         
         # Define the positions in the order they should appear in the CSV
         positions = ['CPT', 'D', 'D', 'D', 'D', 'CNSTR']
         
+        # Build one roster row per lineup
+        roster_rows = []
+        for lineup in lineups:
+            # Create a dictionary to organize players by position
+            players_by_position = {pos: [] for pos in positions}
+            
+            # Sort players into their positions
+            for player in lineup['players']:
+                pos = player['position']
+                if pos in players_by_position:
+                    # Get player ID
+                    player_data = {
+                        'id': player['id'],
+                        'points': player['points']  # Use calculated points
+                    }
+                    players_by_position[pos].append(player_data)
+            
+            # Sort players by average points within each position
+            for pos in players_by_position:
+                if len(players_by_position[pos]) > 0:
+                    players_by_position[pos].sort(key=lambda x: x['points'], reverse=True)
+            
+            # Build the roster row with IDs in the correct position order
+            roster_row = []
+            for pos in positions:
+                if players_by_position[pos] and len(players_by_position[pos]) > 0:
+                    # Take the highest-scoring player for this position
+                    roster_row.append(str(players_by_position[pos].pop(0)['id']))
+                else:
+                    # If no player found for this position (shouldn't happen in a valid lineup)
+                    roster_row.append('')
+            
+            roster_rows.append(roster_row)
+        
         with open(output_path, 'w', newline='') as csvfile:
             csvwriter = csv.writer(csvfile)
             
             # Write the header row
             csvwriter.writerow(positions)
-            
-            # Process each lineup
-            for lineup in lineups:
-                # Create a dictionary to organize players by position
-                players_by_position = {pos: [] for pos in positions}
-                
-                # Sort players into their positions
-                for player in lineup['players']:
-                    pos = player['position']
-                    if pos in players_by_position:
-                        # Get player ID
-                        player_data = {
-                            'id': player['id'],
-                            'points': player['points']  # Use calculated points
-                        }
-                        players_by_position[pos].append(player_data)
-                
-                # Sort players by average points within each position
-                for pos in players_by_position:
-                    if len(players_by_position[pos]) > 0:
-                        players_by_position[pos].sort(key=lambda x: x['points'], reverse=True)
-                
-                # Build the roster row with IDs in the correct position order
-                roster_row = []
-                for pos in positions:
-                    if players_by_position[pos] and len(players_by_position[pos]) > 0:
-                        # Take the highest-scoring player for this position
-                        roster_row.append(str(players_by_position[pos].pop(0)['id']))
-                    else:
-                        # If no player found for this position (shouldn't happen in a valid lineup)
-                        roster_row.append('')
-                
-                # Write the roster row
-                csvwriter.writerow(roster_row)
+            csvwriter.writerows(roster_rows)
         
         print(f"\nLineups saved to {output_path} in position-based format")
     
@@ -432,16 +863,13 @@ class AdvancedLineupOptimizer:
         if not lineups:
             return
             
-        # Count appearances for each player
-        player_usage = defaultdict(int)
-        player_ids = {}  # To map names to IDs
-        
+        # Count appearances and record each player's position in a single pass
+        player_usage = Counter()
+        player_positions = {}
         for lineup in lineups:
             for player in lineup['players']:
-                player_id = player['id']
-                player_name = player['name']
-                player_usage[player_name] += 1
-                player_ids[player_name] = player_id
+                player_usage[player['name']] += 1
+                player_positions[player['name']] = player['position']
                 
         # Print summary
         print(f"\n{'='*80}")
@@ -450,14 +878,8 @@ class AdvancedLineupOptimizer:
         print(f"{'NAME':<30}{'POSITION':<10}{'APPEARANCES':<15}{'% OF LINEUPS':<15}")
         print(f"{'-'*80}")
         
-        # Get position for each player
-        player_positions = {}
-        for lineup in lineups:
-            for player in lineup['players']:
-                player_positions[player['name']] = player['position']
-        
         # Sort players by number of appearances (descending)
-        sorted_players = sorted(player_usage.items(), key=lambda x: x[1], reverse=True)
+        sorted_players = player_usage.most_common()
         
         for player_name, count in sorted_players:
             position = player_positions.get(player_name, "")
@@ -496,6 +918,12 @@ def parse_args():
                         help='Maximum number of times a player can appear across all lineups')
     parser.add_argument('--output', type=str, default='optimized_lineups.csv', 
                         help='Output CSV file name (default: optimized_lineups.csv)')
+    parser.add_argument('--solver', type=str, default='HiGHS', choices=['HiGHS', 'CBC'],
+                        help='MIP solver to use, falls back to CBC if HiGHS is not installed (default: HiGHS)')
+    parser.add_argument('--time-limit', type=int, 
+                        help='Time limit in seconds for each lineup solve')
+    parser.add_argument('--enumerate', action='store_true',
+                        help='List every valid lineup instead of solving a MIP on slates with fewer than 40 players')
     
     return parser.parse_args()
 
@@ -558,7 +986,9 @@ def main():
             csv_path=csv_path,
             salary_cap=args.salary_cap,
             max_from_team=args.max_from_team,
-            min_teams=args.min_teams
+            min_teams=args.min_teams,
+            solver_name=args.solver,
+            time_limit=args.time_limit
         )
         
         # Check if running interactively or from command line
@@ -593,7 +1023,8 @@ def main():
             stack_count=args.stack_count,
             min_salary_used=args.min_salary_used,
             lineup_diversity=args.lineup_diversity,
-            max_player_appearances=args.max_player_appearances
+            max_player_appearances=args.max_player_appearances,
+            use_enumeration=args.enumerate
         )
         
         if not lineups:
@@ -612,9 +1043,7 @@ def main():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Ensure the Outputs directory exists
-        output_dir = os.path.join(os.getcwd(), "Outputs")
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        output_dir = optimizer._outputs_dir()
         
         if __name__ == "__main__" and len(os.sys.argv) <= 1:
             # When running interactively, ask if user wants to save
@@ -624,7 +1053,7 @@ def main():
                 output_base = input(f"Enter filename for detailed output (default: optimized_lineups): ") or "optimized_lineups"
                 output_file = f"{output_base}_{timestamp}.csv"
                 detailed_output = os.path.join(output_dir, output_file)
-                optimizer.save_lineups_to_csv(lineups, detailed_output)
+                optimizer.save_lineups_to_csv(lineups, detailed_output, timestamp)
                 
                 # Save the position-based lineup format (roster format)
                 lineup_base = input(f"Enter filename for position-based roster format (default: lineup): ") or "lineup"
@@ -633,11 +1062,11 @@ def main():
                 
                 num_lineups_to_save = int(input(f"How many lineups to save in roster format? (1-{len(lineups)}, default: {len(lineups)}): ") or len(lineups))
                 num_lineups_to_save = min(num_lineups_to_save, len(lineups))
-                optimizer.save_lineup_to_csv(lineups[:num_lineups_to_save], lineup_output)
+                optimizer.save_lineup_to_csv(lineups[:num_lineups_to_save], lineup_output, timestamp)
                 
                 # Also save to the standard filenames for compatibility
-                optimizer.save_lineups_to_csv(lineups, args.output)
-                optimizer.save_lineup_to_csv(lineups[:num_lineups_to_save], "lineup.csv")
+                optimizer.save_lineups_to_csv(lineups, args.output, timestamp)
+                optimizer.save_lineup_to_csv(lineups[:num_lineups_to_save], "lineup.csv", timestamp)
                 
                 print(f"\nOutputs saved in folder: {output_dir}")
                 print(f"Detailed lineups: {output_file}")
@@ -649,12 +1078,12 @@ def main():
             lineup_output = os.path.join(output_dir, f"lineup_{timestamp}.csv")
             
             # Save both file formats
-            optimizer.save_lineups_to_csv(lineups, detailed_output)
-            optimizer.save_lineup_to_csv(lineups, lineup_output)
+            optimizer.save_lineups_to_csv(lineups, detailed_output, timestamp)
+            optimizer.save_lineup_to_csv(lineups, lineup_output, timestamp)
             
             # Also save to the standard filenames for compatibility
-            optimizer.save_lineups_to_csv(lineups, args.output)
-            optimizer.save_lineup_to_csv(lineups, "lineup.csv")
+            optimizer.save_lineups_to_csv(lineups, args.output, timestamp)
+            optimizer.save_lineup_to_csv(lineups, "lineup.csv", timestamp)
             
             print(f"\nOutputs saved in folder: {output_dir}")
             print(f"Detailed lineups: {os.path.basename(detailed_output)}")
@@ -5,25 +5,29 @@ This makes it easier to find and use the latest salaries file.
 """
 
 import os
-import glob
 import shutil
 from datetime import datetime
 
-def find_latest_dk_file():
-    """Find the latest DraftKings salaries file in the Downloads folder."""
+def find_latest_dk_file(directory=None):
+    """Find the latest DraftKings salaries file in a directory (default: the Downloads folder)."""
     # Get the user's Downloads directory
-    downloads_dir = os.path.join(os.path.expanduser("~"), "Downloads")
+    if directory is None:
+        directory = os.path.join(os.path.expanduser("~"), "Downloads")
     
-    # Look for DK Salaries files
-    pattern = os.path.join(downloads_dir, "DKSalaries*.csv")
-    files = glob.glob(pattern)
+    # Look for DK Salaries files; scandir entries cache their stat info,
+    # so there's no separate stat call per file
+    try:
+        with os.scandir(directory) as entries:
+            files = [entry for entry in entries
+                     if entry.name.startswith("DKSalaries") and entry.name.endswith(".csv") and entry.is_file()]
+    except OSError:
+        return None
     
     if not files:
         return None
         
-    # Sort by modification time, newest first
-    files.sort(key=os.path.getmtime, reverse=True)
-    return files[0]
+    # Newest by modification time
+    return max(files, key=lambda entry: entry.stat().st_mtime).path
 
 def main():
     # Find the latest DK salaries file
@@ -8,162 +8,347 @@ salary constraints.
 """
 
 import os
-import csv
+import functools
+import shutil
+import numpy as np
 import pandas as pd
 import pulp as plp
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Union
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import argparse
 from datetime import datetime
 
+from _kernels import assemble_lineup
+from copy_dk_file import find_latest_dk_file
+
+try:
+    import pyarrow  # noqa: F401 (optional; lets pandas use its multithreaded CSV reader)
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+# Columns read from the player CSV and their types; the parser converts them directly.
+# Repeated strings are stored as categories.
+PLAYER_COLUMNS = {
+    'ID': 'int64',
+    'Name': 'category',
+    'Roster Position': 'category',
+    'TeamAbbrev': 'category',
+    'Game Info': 'category',
+    'Salary': 'int64',
+    'AvgPointsPerGame': 'float64',
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_players_cached(csv_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Read a player CSV, caching the result per file version.
+    
+    The modification time and size are part of the cache key, so an edited file is read again.
+    
+    Args:
+        csv_path: Path to the CSV file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+        
+    Returns:
+        DataFrame with the raw CSV contents (shared; copy before modifying)
+    """
+    return pd.read_csv(csv_path, usecols=list(PLAYER_COLUMNS), dtype=PLAYER_COLUMNS, engine=CSV_ENGINE)
+
 
 class LineupOptimizer:
     """Class to handle the optimization of Daily Fantasy Formula 1 lineups."""
 
-    def __init__(self, csv_path: str, salary_cap: int = 50000):
+    def __init__(
+        self,
+        csv_path: Union[str, pd.DataFrame],
+        salary_cap: int = 50000,
+        solver_name: str = 'HiGHS',
+        solver: Optional[plp.LpSolver] = None
+    ):
         """
         Initialize the lineup optimizer with player data and constraints.
         
         Args:
-            csv_path: Path to the CSV file containing driver/constructor data
+            csv_path: Path to the CSV file containing driver/constructor data, or a DataFrame with the same columns
             salary_cap: Maximum salary allowed for the roster (default: $50,000)
+            solver_name: MIP solver to use ('HiGHS' or 'CBC'); falls back to CBC if highspy is unavailable
+            solver: Preconfigured PuLP solver to use instead of the one chosen by solver_name
         """
         self.salary_cap = salary_cap
+        self.solver_name = solver_name
+        self.solver = solver
         self.players_df = self._load_data(csv_path)
         self.required_positions = {
             'CPT': 1,  # Captain (1.5x points)
             'D': 4,    # Drivers
             'CNSTR': 1 # Constructor
         }
+        
+        # Player attributes as NumPy arrays, computed once instead of walking the
+        # DataFrame rows for every constraint of every lineup
+        self._ids = self.players_df['ID'].to_numpy()
+        self._salaries = self.players_df['Salary'].to_numpy()
+        # Positions as int8 codes in lineup order (0=CPT, 1=D, 2=CNSTR, -1 if not a roster slot)
+        self._position_codes = {position: code for code, position in enumerate(self.required_positions)}
+        self._pos_codes = np.array([self._position_codes.get(position, -1) 
+                                    for position in self.players_df['Roster Position']], dtype=np.int8)
+        self._points = np.where(self._pos_codes == self._position_codes['CPT'],
+                                self.players_df['CaptainPoints'], self.players_df['AvgPointsPerGame'])
+        
+        # ID groups for drivers listed in more than one slot (CPT and D versions of the same driver)
+        self._driver_id_pairs = [ids for ids in self.players_df.groupby('Name', observed=True)['ID'].apply(list) if len(ids) > 1]
+        
+        # Player rows keyed by ID for O(1) lookups when building lineup output
+        self._player_by_id = {row['ID']: row for row in self.players_df.to_dict('records')}
+        # Row numbers keyed by (name, roster position), e.g. to find a captain's D listing
+        self._row_by_name_pos = dict(zip(zip(self.players_df['Name'], self.players_df['Roster Position']),
+                                         range(len(self.players_df))))
 
-    def _load_data(self, csv_path: str) -> pd.DataFrame:
+    def _load_data(self, csv_path: Union[str, pd.DataFrame]) -> pd.DataFrame:
         """
         Load driver/constructor data from CSV file.
         
         Args:
-            csv_path: Path to the CSV file
+            csv_path: Path to the CSV file, or a DataFrame with the CSV's columns (not modified)
             
         Returns:
             DataFrame containing player information
         """
-        df = pd.read_csv(csv_path)
-        # Ensure we use the Roster Position for our optimization
-        # and that the data types are correct
-        df['Salary'] = df['Salary'].astype(int)
-        df['AvgPointsPerGame'] = df['AvgPointsPerGame'].astype(float)
+        if isinstance(csv_path, pd.DataFrame):
+            # Same columns and types as reading the CSV
+            df = csv_path[list(PLAYER_COLUMNS)].astype(PLAYER_COLUMNS)
+        else:
+            stat = os.stat(csv_path)
+            df = _read_players_cached(os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size).copy()
         
         # Calculate Captain points (1.5x the regular points)
-        df['CaptainPoints'] = df['AvgPointsPerGame'] * 1.5
+        df['CaptainPoints'] = df['AvgPointsPerGame'].to_numpy() * 1.5
         return df
 
-    def optimize(self, num_lineups: int = 10) -> List[Dict]:
+    def _make_solver(self) -> plp.LpSolver:
+        """
+        Create the solver used for each lineup solve.
+        
+        Uses the solver passed to the constructor if there is one. Otherwise prefers PuLP's
+        in-process HiGHS binding (highspy), which solves the model without writing an LP file
+        and starting a solver process for every lineup, and falls back to the CBC solver
+        bundled with PuLP, warm started from the previous lineup.
+        
+        Returns:
+            A configured PuLP solver instance
+        """
+        if self.solver is not None:
+            return self.solver
+        
+        if self.solver_name.lower() == 'highs' and hasattr(plp, 'HiGHS'):
+            solver = plp.HiGHS(msg=False)
+            if solver.available():
+                return solver
+        
+        return plp.PULP_CBC_CMD(msg=False, warmStart=True)
+
+    def _build_model(self) -> Tuple[plp.LpProblem, List[plp.LpVariable], Dict[int, plp.LpVariable]]:
+        """
+        Build the lineup model with the objective and the constraints shared by every lineup.
+        
+        Returns:
+            Tuple of the problem, the player variables in row order and the same variables keyed by ID
+        """
+        prob = plp.LpProblem("DFS_Lineup", plp.LpMaximize)
+        
+        # Create a binary variable for each player
+        ids = self._ids.tolist()
+        var_list = [plp.LpVariable(f"player_{player_id}", cat='Binary') for player_id in ids]
+        player_vars = dict(zip(ids, var_list))
+        
+        # Build the coefficient expressions directly from (variable, coefficient) pairs
+        # rather than summing scaled variables term by term
+        
+        # Objective function: Maximize total points
+        # Note: Captain points are 1.5x
+        prob += plp.LpAffineExpression(list(zip(var_list, self._points.tolist())))
+        
+        # Constraint 1: Salary cap
+        prob += plp.LpAffineExpression(list(zip(var_list, self._salaries.tolist()))) <= self.salary_cap
+        
+        # Constraint 2: Position requirements
+        for code, count in enumerate(self.required_positions.values()):
+            prob += plp.lpSum(var_list[idx] for idx in np.flatnonzero(self._pos_codes == code)) == count
+        
+        # Constraint 3: Total number of roster spots
+        prob += plp.lpSum(var_list) == sum(self.required_positions.values())
+        
+        # Constraint 4: Can't pick both captain and regular versions of same driver
+        for driver_ids in self._driver_id_pairs:
+            # Constraint: Can only choose at most one version of this driver
+            prob += plp.lpSum(player_vars[player_id] for player_id in driver_ids) <= 1
+        
+        return prob, var_list, player_vars
+
+    def optimize(self, num_lineups: int = 10, jobs: int = 1) -> List[Dict]:
         """
         Generate optimized lineups.
         
         Args:
             num_lineups: Number of different lineups to generate
+            jobs: Number of worker processes; more than one solves captains in parallel
             
         Returns:
             List of dictionaries, each containing a lineup with player details
         """
+        if self._is_trivially_infeasible():
+            print("No lineup fits the roster requirements within the salary cap")
+            return []
+        
+        if jobs > 1:
+            return self._optimize_parallel(num_lineups, jobs)
+        
         lineups = []
         
-        # Create a list to store previously used player combinations
-        previous_lineups_players = []
+        # Build the model once; each new lineup only adds a uniqueness cut to it
+        prob, var_list, player_vars = self._build_model()
+        
+        solver = self._make_solver()
         
         for i in range(num_lineups):
-            # Create a new linear programming problem
-            prob = plp.LpProblem(f"DFS_Lineup_{i+1}", plp.LpMaximize)
-            
-            # Create a binary variable for each player
-            player_vars = {row['ID']: plp.LpVariable(f"player_{row['ID']}", cat='Binary') 
-                           for _, row in self.players_df.iterrows()}
-            
-            # Objective function: Maximize total points
-            # Note: Captain points are 1.5x
-            prob += plp.lpSum(
-                row['CaptainPoints'] * player_vars[row['ID']] if row['Roster Position'] == 'CPT' 
-                else row['AvgPointsPerGame'] * player_vars[row['ID']]
-                for _, row in self.players_df.iterrows()
-            )
-            
-            # Constraint 1: Salary cap
-            prob += plp.lpSum(row['Salary'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows()) <= self.salary_cap
-            
-            # Constraint 2: Position requirements
-            for position, count in self.required_positions.items():
-                prob += plp.lpSum(player_vars[row['ID']] 
-                                 for _, row in self.players_df.iterrows() 
-                                 if row['Roster Position'] == position) == count
-            
-            # Constraint 3: Total number of roster spots
-            prob += plp.lpSum(player_vars.values()) == sum(self.required_positions.values())
-            
-            # Constraint 4: Can't pick both captain and regular versions of same driver
-            # Get unique driver names
-            driver_names = self.players_df['Name'].unique()
-            
-            for driver_name in driver_names:
-                # Get IDs for both versions of this driver (CPT and D)
-                driver_ids = self.players_df[self.players_df['Name'] == driver_name]['ID'].tolist()
-                
-                if len(driver_ids) > 1:  # If driver has both CPT and regular version
-                    # Constraint: Can only choose at most one version of this driver
-                    prob += plp.lpSum(player_vars[id] for id in driver_ids) <= 1
-            
-            # Constraint 5: Ensure uniqueness from previous lineups
-            for prev_lineup in previous_lineups_players:
-                # Add constraint that the new lineup must differ from each previous lineup by at least 2 players
-                prob += plp.lpSum(player_vars[player_id] for player_id in prev_lineup) <= len(prev_lineup) - 2
-            
             # Solve the problem
-            prob.solve(plp.PULP_CBC_CMD(msg=False))
+            prob.solve(solver)
             
             # Check if a solution was found
             if plp.LpStatus[prob.status] != 'Optimal':
                 print(f"Could not find optimal solution for lineup {i+1}")
-                continue
+                # The model only changes when a lineup is found, so later solves would fail too
+                break
                 
             # Extract the selected players
-            selected_player_ids = [int(p_id) for p_id, var in player_vars.items() 
-                                 if plp.value(var) == 1]
-            previous_lineups_players.append(selected_player_ids)
+            # Read the solution vector in one pass; threshold instead of comparing floats to 1
+            solution = np.fromiter((var.varValue for var in var_list), dtype=np.float64, count=len(var_list))
+            selected = np.flatnonzero(solution > 0.5)
             
-            # Create lineup data
-            lineup_data = {
-                'players': [],
-                'total_salary': 0,
-                'total_points': 0
-            }
+            # Constraint 5: Ensure uniqueness from previous lineups
+            # Next lineup must differ from this one by at least 2 players
+            prob += plp.lpSum(var_list[idx] for idx in selected.tolist()) <= len(selected) - 2
             
-            for player_id in selected_player_ids:
-                player = self.players_df[self.players_df['ID'] == player_id].iloc[0]
+            lineups.append(self._build_lineup(selected))
+        
+        # Sort lineups by total points in descending order
+        lineups.sort(key=lambda x: x['total_points'], reverse=True)
+        return lineups
+
+    def _is_trivially_infeasible(self) -> bool:
+        """
+        Check whether no lineup can be valid, without building the model.
+        
+        Returns:
+            True if a position has too few players, or the cheapest players for each
+            position already cost more than the salary cap
+        """
+        min_salary = 0
+        for code, count in enumerate(self.required_positions.values()):
+            salaries = np.sort(self._salaries[self._pos_codes == code])
+            if len(salaries) < count:
+                return True
+            min_salary += int(salaries[:count].sum())
+        return min_salary > self.salary_cap
+
+    def _optimize_parallel(self, num_lineups: int, jobs: int) -> List[Dict]:
+        """
+        Generate the same lineups as optimize, solving one subproblem per captain in parallel.
+        
+        Every lineup has exactly one captain, so the best lineup overall is the best of the
+        per-captain best lineups. After a lineup is picked, only the captains whose best lineup
+        now breaks the uniqueness constraint need to be solved again; the others are still optimal.
+        
+        Args:
+            num_lineups: Number of different lineups to generate
+            jobs: Number of worker processes
+            
+        Returns:
+            List of dictionaries, each containing a lineup with player details
+        """
+        lineups = []
+        previous_lineups = []
+        best_by_captain = {}
+        stale = np.flatnonzero(self._pos_codes == self._position_codes['CPT']).tolist()
+        
+        # Each worker receives the optimizer and builds the shared model once, when it starts
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_captain_worker, initargs=(self,)) as executor:
+            for i in range(num_lineups):
+                results = executor.map(_solve_captain_lineup, stale, repeat(previous_lineups))
+                best_by_captain.update(zip(stale, results))
                 
-                # Calculate points based on position
-                points = player['CaptainPoints'] if player['Roster Position'] == 'CPT' else player['AvgPointsPerGame']
+                candidates = [selected for selected in best_by_captain.values() if selected is not None]
+                if not candidates:
+                    print(f"Could not find optimal solution for lineup {i+1}")
+                    break
                 
-                lineup_data['players'].append({
-                    'id': player['ID'],
-                    'name': player['Name'],
-                    'position': player['Roster Position'],
-                    'team': player['TeamAbbrev'],
-                    'game_info': player['Game Info'],
-                    'salary': player['Salary'],
-                    'avg_points': player['AvgPointsPerGame'],  # Base points
-                    'points': points  # Calculated points (with captain multiplier if applicable)
-                })
-                lineup_data['total_salary'] += player['Salary']
-                lineup_data['total_points'] += points
-            
-            # Sort players by position in the required order (CPT first, then D, then CNSTR)
-            position_order = {'CPT': 0, 'D': 1, 'CNSTR': 2}
-            lineup_data['players'].sort(key=lambda x: (position_order[x['position']], -x['points']))
-            
-            lineups.append(lineup_data)
+                selected = max(candidates, key=lambda rows: self._points[rows].sum())
+                previous_lineups.append(selected)
+                lineups.append(self._build_lineup(np.array(selected)))
+                
+                # Captains whose best lineup shares too many players with the new one
+                chosen = set(selected)
+                stale = [captain for captain, rows in best_by_captain.items()
+                         if rows is not None and len(chosen.intersection(rows)) > len(selected) - 2]
         
         # Sort lineups by total points in descending order
         lineups.sort(key=lambda x: x['total_points'], reverse=True)
         return lineups
 
+    def _build_lineup(self, selected: np.ndarray) -> Dict:
+        """
+        Create the lineup dictionary for a set of selected players.
+        
+        Args:
+            selected: Row indices of the players in the lineup
+            
+        Returns:
+            Dictionary with the lineup's players, total salary and total points
+        """
+        # Order the players (CPT first, then D, then CNSTR, by points within a position)
+        # and total the lineup in the assemble_lineup kernel
+        order, total_salary, total_points = assemble_lineup(selected, self._pos_codes, self._salaries, self._points)
+        
+        # Create lineup data; by_position holds the player for single slots (CPT, CNSTR)
+        # and a list for D, by_team the number of players from each team
+        lineup_data = {
+            'players': [],
+            'total_salary': int(total_salary),
+            'total_points': float(total_points),
+            'by_position': {position: [] if count > 1 else None
+                            for position, count in self.required_positions.items()},
+            'by_team': Counter()
+        }
+        
+        for idx in order.tolist():
+            player = self._player_by_id[self._ids[idx]]
+            
+            player_data = {
+                'id': player['ID'],
+                'name': player['Name'],
+                'position': player['Roster Position'],
+                'team': player['TeamAbbrev'],
+                'game_info': player['Game Info'],
+                'salary': player['Salary'],
+                'avg_points': player['AvgPointsPerGame'],  # Base points
+                'points': float(self._points[idx])  # Calculated points (with captain multiplier if applicable)
+            }
+            lineup_data['players'].append(player_data)
+            
+            if self.required_positions[player_data['position']] > 1:
+                lineup_data['by_position'][player_data['position']].append(player_data)
+            else:
+                lineup_data['by_position'][player_data['position']] = player_data
+            lineup_data['by_team'][player_data['team']] += 1
+        
+        return lineup_data
+
     def display_lineups(self, lineups: List[Dict]) -> None:
         """
         Display the optimized lineups in a readable format.
@@ -221,71 +406,97 @@ class LineupOptimizer:
         # Define the positions in the order they should appear in the CSV
         positions = ['CPT', 'D', 'D', 'D', 'D', 'CNSTR']
         
-        with open(output_path, 'w', newline='') as csvfile:
-            csvwriter = csv.writer(csvfile)
-            
-            # Write the header row
-            csvwriter.writerow(positions)
-            
-            # Process each lineup
-            for lineup in lineups:
-                # Create a dictionary to organize players by position
-                players_by_position = {pos: [] for pos in positions}
-                
-                # Sort players into their positions
-                for player in lineup['players']:
-                    pos = player['position']
-                    if pos in players_by_position:
-                        # Get player ID (already stored in player data)
-                        player_data = {
-                            'id': player['id'],
-                            'points': player['points']  # Use calculated points
-                        }
-                        players_by_position[pos].append(player_data)
-                
-                # Sort players by average points within each position
-                for pos in players_by_position:
-                    if len(players_by_position[pos]) > 0:
-                        players_by_position[pos].sort(key=lambda x: x['points'], reverse=True)
-                
-                # Build the roster row with IDs in the correct position order
-                roster_row = []
-                for pos in positions:
-                    if players_by_position[pos] and len(players_by_position[pos]) > 0:
-                        # Take the highest-scoring player for this position
-                        roster_row.append(str(players_by_position[pos].pop(0)['id']))
-                    else:
-                        # If no player found for this position (shouldn't happen in a valid lineup)
-                        roster_row.append('')
-                
-                # Write the roster row
-                csvwriter.writerow(roster_row)
+        # One row per lineup player with its position code, sorted so each position's
+        # highest-scoring player comes first
+        players = pd.DataFrame(
+            [(lineup_idx, self._position_codes.get(player['position'], -1), str(player['id']), player['points'])
+             for lineup_idx, lineup in enumerate(lineups) for player in lineup['players']],
+            columns=['lineup', 'pos_code', 'id', 'points']
+        )
+        players = players[players['pos_code'] >= 0]
+        players = players.sort_values(['lineup', 'points'], ascending=[True, False], kind='stable')
+        
+        # Column of each player in the roster row: the position's first column plus its rank within the position
+        slot_counts = np.array(list(self.required_positions.values()))
+        first_column = np.cumsum(slot_counts) - slot_counts
+        pos_codes = players['pos_code'].to_numpy()
+        rank = players.groupby(['lineup', 'pos_code']).cumcount().to_numpy()
+        players['column'] = first_column[pos_codes] + rank
+        players = players[rank < slot_counts[pos_codes]]
+        
+        # Empty cells for positions without a player (shouldn't happen in a valid lineup)
+        roster = (players.pivot(index='lineup', columns='column', values='id')
+                  .reindex(index=range(len(lineups)), columns=range(len(positions)))
+                  .fillna(''))
+        roster.to_csv(output_path, index=False, header=positions, lineterminator='\r\n')
         
         print(f"\nLineups saved to {output_path} in position-based format")
 
 
+# Per-process state of the _optimize_parallel workers, set by _init_captain_worker
+_worker_state = {}
+
+
+def _init_captain_worker(optimizer: LineupOptimizer) -> None:
+    """
+    Set up a process pool worker: build the model shared by every captain subproblem once.
+    
+    Args:
+        optimizer: Optimizer holding the player data and settings
+    """
+    prob, var_list, _ = optimizer._build_model()
+    _worker_state.update(prob=prob, var_list=var_list, solver=optimizer._make_solver())
+
+
+def _solve_captain_lineup(captain: int, previous_lineups: List[List[int]]) -> Optional[List[int]]:
+    """
+    Solve for the best lineup with a given captain (process pool worker).
+    
+    Args:
+        captain: Row index of the captain
+        previous_lineups: Row indices of the lineups generated so far
+        
+    Returns:
+        Row indices of the selected players, or None if no optimal lineup was found
+    """
+    var_list = _worker_state['var_list']
+    
+    # Copy of the worker's model for this subproblem; the copy has its own constraints
+    # but shares the variables, so the captain's bound is reset after the solve
+    prob = _worker_state['prob'].deepcopy()
+    for prev_lineup in previous_lineups:
+        prob += plp.lpSum(var_list[idx] for idx in prev_lineup) <= len(prev_lineup) - 2
+    var_list[captain].lowBound = 1
+    try:
+        prob.solve(_worker_state['solver'])
+    finally:
+        var_list[captain].lowBound = 0
+    
+    if plp.LpStatus[prob.status] != 'Optimal':
+        return None
+    return [idx for idx, var in enumerate(var_list) if var.varValue > 0.5]
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Optimize Daily Fantasy Formula 1 lineups')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes for solving lineups (default: 1)')
+    return parser.parse_args()
+
+
 def main():
     """Main function to run the optimization process."""
-    # First look for the CSV in the downloads directory
-    user_downloads = os.path.join(os.path.expanduser("~"), "Downloads")
-    csv_filename = "DKSalaries*.csv"
+    args = parse_args()
     
-    # Check in common locations for the CSV file
-    possible_paths = [
-        os.path.join(user_downloads, csv_filename),  # User's Downloads folder
-        os.path.join(os.getcwd(), csv_filename),     # Current working directory
-        csv_filename                                 # Just the filename (if in current directory)
-    ]
+    # First look for the CSV in the downloads directory, then the current working directory
+    user_downloads = os.path.join(os.path.expanduser("~"), "Downloads")
     
     csv_path = None
-    # Import glob to use wildcard patterns
-    import glob
-    for path_pattern in possible_paths:
-        matching_files = glob.glob(path_pattern)
-        if matching_files:
-            # Sort by modification time to get the most recent file
-            matching_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            csv_path = matching_files[0]
+    for directory in (user_downloads, os.getcwd()):
+        # Most recently modified DKSalaries*.csv file in this directory
+        csv_path = find_latest_dk_file(directory)
+        if csv_path:
             break
     
     if not csv_path:
@@ -306,7 +517,7 @@ def main():
             num_lineups = int(input("Enter number of lineups to generate (default 10): ") or 10)
             optimizer.salary_cap = salary_cap
         
-        lineups = optimizer.optimize(num_lineups)
+        lineups = optimizer.optimize(num_lineups, jobs=args.jobs)
         
         # Display the results
         optimizer.display_lineups(lineups)
@@ -331,36 +542,15 @@ def main():
             timestamped_name = f"{name_parts[0]}_{timestamp}{name_parts[1]}"
             output_path = os.path.join(output_dir, timestamped_name)
             
-            with open(output_path, 'w', newline='') as csvfile:
-                csvwriter = csv.writer(csvfile)
-                csvwriter.writerow(['Lineup', 'Position', 'Name', 'Team', 'Salary', 'Avg Points'])
-                
-                for i, lineup in enumerate(lineups, 1):
-                    for player in lineup['players']:
-                        csvwriter.writerow([
-                            i, 
-                            player['position'], 
-                            player['name'], 
-                            player['team'],
-                            player['salary'], 
-                            player['avg_points']
-                        ])
+            detailed = pd.DataFrame(
+                [(i, player['position'], player['name'], player['team'], player['salary'], player['avg_points'])
+                 for i, lineup in enumerate(lineups, 1) for player in lineup['players']],
+                columns=['Lineup', 'Position', 'Name', 'Team', 'Salary', 'Avg Points']
+            )
+            detailed.to_csv(output_path, index=False, lineterminator='\r\n')
             
             # Also save to the standard filename in the base directory for compatibility
-            with open(output_file, 'w', newline='') as csvfile:
-                csvwriter = csv.writer(csvfile)
-                csvwriter.writerow(['Lineup', 'Position', 'Name', 'Team', 'Salary', 'Avg Points'])
-                
-                for i, lineup in enumerate(lineups, 1):
-                    for player in lineup['players']:
-                        csvwriter.writerow([
-                            i, 
-                            player['position'], 
-                            player['name'], 
-                            player['team'],
-                            player['salary'], 
-                            player['avg_points']
-                        ])
+            shutil.copyfile(output_path, output_file)
             
             print(f"\nDetailed lineups saved to {output_path}")
             
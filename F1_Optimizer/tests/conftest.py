@@ -0,0 +1,13 @@
+"""
+pytest configuration for the F1 optimizer tests.
+
+Puts the F1_Optimizer directory on sys.path once, so the test modules can import the
+optimizer modules directly (run_tests.py does the same for the unittest runner).
+"""
+
+import sys
+import pathlib
+
+F1_OPTIMIZER_DIR = str(pathlib.Path(__file__).resolve().parents[1])
+if F1_OPTIMIZER_DIR not in sys.path:
+    sys.path.insert(0, F1_OPTIMIZER_DIR)
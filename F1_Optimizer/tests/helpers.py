@@ -0,0 +1,11 @@
+"""
+Shared helpers for the F1 optimizer tests.
+"""
+
+import pulp as plp
+
+# Light solver for the tiny test models: in-process HiGHS when highspy is installed,
+# otherwise single-threaded CBC without presolve and cut generation
+_highs = plp.HiGHS(msg=False)
+TEST_SOLVER = (_highs if _highs.available()
+               else plp.PULP_CBC_CMD(msg=False, threads=1, presolve=False, cuts=False, warmStart=True))
@@ -7,54 +7,50 @@ including team stacking, driver correlation, and lineup diversity constraints.
 """
 
 import os
-import sys
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
-from unittest.mock import patch, MagicMock
+import pulp as plp
+from collections import Counter
+from unittest.mock import patch
 
-# Add the parent directory to the path so we can import the optimizer modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from advanced_optimizer import AdvancedLineupOptimizer
+from tests.helpers import TEST_SOLVER
 
 
 class TestAdvancedF1LineupOptimizer(unittest.TestCase):
     """Test cases for the advanced F1 lineup optimizer."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures once for all test methods."""
         # Create a sample test CSV data for the optimizer with F1 drivers and constructors
-        self.test_data = pd.DataFrame({
-            'ID': list(range(20)),
-            'Name': [f'Driver{i}' for i in range(10)] + [f'Constructor{i}' for i in range(10)],
-            'Roster Position': ['D', 'CPT', 'D', 'D', 'CPT', 'D', 'D', 'D', 'CPT', 'D'] + ['CNSTR'] * 10,
-            'TeamAbbrev': ['MERC', 'RBULL', 'FERR', 'MCLA', 'ALPI'] * 4,
-            'Game Info': ['Monaco GP'] * 20,
-            'Salary': [12000, 15000, 10000, 8000, 9000, 7500, 6000, 5000, 11000, 9500] + 
-                      [8000, 12000, 9000, 7000, 6000, 5000, 7500, 8500, 9500, 10500],
-            'AvgPointsPerGame': [50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0] + 
-                                [40.0, 70.0, 50.0, 35.0, 30.0, 25.0, 45.0, 55.0, 60.0, 65.0],
+        index = np.arange(10).astype(str)
+        cls.test_data = pd.DataFrame({
+            'ID': np.arange(20),
+            'Name': np.concatenate([np.char.add('Driver', index), np.char.add('Constructor', index)]),
+            'Roster Position': np.concatenate([['D', 'CPT', 'D', 'D', 'CPT', 'D', 'D', 'D', 'CPT', 'D'],
+                                               np.repeat('CNSTR', 10)]),
+            'TeamAbbrev': np.tile(['MERC', 'RBULL', 'FERR', 'MCLA', 'ALPI'], 4),
+            'Game Info': np.repeat('Monaco GP', 20),
+            'Salary': np.array([12000, 15000, 10000, 8000, 9000, 7500, 6000, 5000, 11000, 9500,
+                                8000, 12000, 9000, 7000, 6000, 5000, 7500, 8500, 9500, 10500]),
+            'AvgPointsPerGame': np.array([50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0,
+                                          40.0, 70.0, 50.0, 35.0, 30.0, 25.0, 45.0, 55.0, 60.0, 65.0]),
         })
 
-        # Create a temporary CSV file for testing
-        self.test_csv_path = 'test_f1_players.csv'
-        self.test_data.to_csv(self.test_csv_path, index=False)
-        
-        # Initialize the optimizer with the test data
-        self.optimizer = AdvancedLineupOptimizer(
-            self.test_csv_path, 
+        # Initialize the optimizer with the test data; optimize() doesn't change its state,
+        # so all tests can share it
+        cls.optimizer = AdvancedLineupOptimizer(
+            cls.test_data, 
             salary_cap=50000,
             max_from_team=3,
             min_teams=2,
-            max_player_appearances=1
+            max_player_appearances=1,
+            solver=TEST_SOLVER
         )
 
-    def tearDown(self):
-        """Clean up after each test method."""
-        # Remove the temporary CSV file
-        if os.path.exists(self.test_csv_path):
-            os.remove(self.test_csv_path)
-
     def test_init(self):
         """Test the initialization of the AdvancedLineupOptimizer class."""
         self.assertEqual(self.optimizer.salary_cap, 50000)
@@ -67,6 +63,56 @@ class TestAdvancedF1LineupOptimizer(unittest.TestCase):
             'CPT': 1, 'D': 4, 'CNSTR': 1
         })
 
+    def test_make_solver(self):
+        """Test solver selection and the CBC fallback."""
+        cbc_optimizer = AdvancedLineupOptimizer(self.test_data, solver_name='CBC')
+        self.assertIsInstance(cbc_optimizer._make_solver(), plp.PULP_CBC_CMD)
+
+        # When HiGHS isn't installed the optimizer should fall back to CBC
+        with patch('pulp.HiGHS.available', return_value=False), \
+             patch('pulp.HiGHS_CMD.available', return_value=False):
+            self.assertIsInstance(self.optimizer._make_solver(), plp.PULP_CBC_CMD)
+
+    def test_data_loading_cache(self):
+        """Test that cached CSV data is reused but not shared between optimizers."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        csv_path = os.path.join(tmp.name, 'players.csv')
+        self.test_data.to_csv(csv_path, index=False)
+
+        other_optimizer = AdvancedLineupOptimizer(csv_path)
+        other_optimizer.players_df.loc[0, 'Salary'] = 1
+
+        optimizer = AdvancedLineupOptimizer(csv_path)
+        self.assertEqual(optimizer.players_df.loc[0, 'Salary'], 12000)
+        self.assertEqual(optimizer.players_df['EffectivePoints'].tolist(),
+                         self.optimizer.players_df['EffectivePoints'].tolist())
+
+    def test_greedy_lineup(self):
+        """Test that the greedy seed lineup respects roster and salary rules."""
+        picks = self.optimizer._greedy_lineup(excluded_ids={1})
+
+        self.assertEqual(len(picks), 6)
+        self.assertNotIn(1, picks)
+
+        picked = self.test_data[self.test_data['ID'].isin(picks)]
+        positions = picked['Roster Position'].tolist()
+        self.assertEqual(positions.count('CPT'), 1)
+        self.assertEqual(positions.count('D'), 4)
+        self.assertEqual(positions.count('CNSTR'), 1)
+        self.assertLessEqual(picked['Salary'].sum(), 50000)
+
+    def test_greedy_seed_needs_mip_start(self):
+        """Test that the greedy seed is only computed for solvers that take a MIP start."""
+        for warm_start, expected_calls in ((True, 2), (False, 0)):
+            optimizer = AdvancedLineupOptimizer(self.test_data, solver=plp.PULP_CBC_CMD(msg=False, warmStart=warm_start))
+            with self.subTest(warm_start=warm_start), \
+                 patch.object(optimizer, '_greedy_lineup', wraps=optimizer._greedy_lineup) as greedy_lineup:
+                lineups = optimizer.optimize(num_lineups=2)
+
+                self.assertEqual(len(lineups), 2)
+                self.assertEqual(greedy_lineup.call_count, expected_calls)
+
     def test_optimize_basic_functionality(self):
         """Test basic optimization functionality."""
         lineups = self.optimizer.optimize(num_lineups=1)
@@ -120,20 +166,16 @@ class TestAdvancedF1LineupOptimizer(unittest.TestCase):
         
         # Create a new optimizer with a lower max_from_team setting
         optimizer = AdvancedLineupOptimizer(
-            self.test_csv_path,
-            max_from_team=max_from_team
+            self.test_data,
+            max_from_team=max_from_team,
+            solver=TEST_SOLVER
         )
         
         lineups = optimizer.optimize(num_lineups=1)
         
         # Check that no team has more than max_from_team players
-        team_counts = {}
-        for player in lineups[0]['players']:
-            team = player['team']
-            team_counts[team] = team_counts.get(team, 0) + 1
-        
-        for team, count in team_counts.items():
-            self.assertLessEqual(count, max_from_team)
+        team_counts = Counter(player['team'] for player in lineups[0]['players'])
+        self.assertLessEqual(max(team_counts.values()), max_from_team)
 
     def test_player_appearance_limit(self):
         """Test limiting the number of times a player can appear across lineups."""
@@ -179,6 +221,43 @@ class TestAdvancedF1LineupOptimizer(unittest.TestCase):
                 # There should be at most 6 - diversity common players
                 self.assertLessEqual(len(common_players), 6 - diversity)
 
+    def test_lineups_without_diversity(self):
+        """Test that every requested lineup is returned without diversity cuts or appearance limits."""
+        num_lineups = 3
+        lineups = self.optimizer.optimize(num_lineups=num_lineups, lineup_diversity=0)
+
+        self.assertEqual(len(lineups), num_lineups)
+
+        for lineup in lineups:
+            positions = [player['position'] for player in lineup['players']]
+            self.assertEqual(positions.count('CPT'), 1)
+            self.assertEqual(positions.count('D'), 4)
+            self.assertEqual(positions.count('CNSTR'), 1)
+            self.assertLessEqual(lineup['total_salary'], 50000)
+
+    def test_enumeration_matches_mip(self):
+        """Test that enumerating small slates gives the same lineups as the MIP."""
+        basic_ids = [1, 0, 2, 4, 9, 11]
+        for options in (dict(num_lineups=4, stack_team='MERC', lineup_diversity=2, max_player_appearances=3),
+                        dict(num_lineups=3, lineup_diversity=0),
+                        dict(num_lineups=3, initial_lineup=basic_ids)):
+            with self.subTest(**options):
+                solved = self.optimizer.optimize(**options)
+                enumerated = self.optimizer.optimize(use_enumeration=True, **options)
+                
+                self.assertEqual(len(enumerated), len(solved))
+                for enumerated_lineup, solved_lineup in zip(enumerated, solved):
+                    self.assertAlmostEqual(enumerated_lineup['total_points'], solved_lineup['total_points'])
+
+    def test_initial_lineup(self):
+        """Test that an initial lineup only seeds the solver, even when it is infeasible."""
+        expected = self.optimizer.optimize(num_lineups=1)
+        # Six drivers, no captain or constructor: breaks the roster rules
+        seeded = self.optimizer.optimize(num_lineups=1, initial_lineup=[0, 2, 3, 5, 6, 7])
+
+        self.assertEqual(len(seeded), 1)
+        self.assertAlmostEqual(seeded[0]['total_points'], expected[0]['total_points'])
+
     def test_min_salary_used_constraint(self):
         """Test minimum salary used constraint."""
         min_salary_pct = 0.95
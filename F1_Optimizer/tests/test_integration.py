@@ -8,71 +8,79 @@ to generating valid lineups that meet all contest rules.
 """
 
 import os
-import sys
 import unittest
+import numpy as np
 import pandas as pd
-import subprocess
+import pulp as plp
+import tempfile
 from unittest.mock import patch
 
-# Add the parent directory to the path so we can import the modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from optimizer import LineupOptimizer
 from advanced_optimizer import AdvancedLineupOptimizer
+from tests.helpers import TEST_SOLVER
 
 
 class TestF1OptimizerIntegration(unittest.TestCase):
     """Integration tests for the F1 optimizer."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures once for all test methods."""
         # Create a realistic test dataset with driver and constructor data
-        self.test_data = pd.DataFrame({
-            'ID': list(range(30)),
-            # Regular drivers
-            'Name': [f'Driver{i}' for i in range(10)] + 
-                   # Captain versions of the same drivers
-                   [f'Driver{i}' for i in range(10)] + 
-                   # Constructors
-                   [f'Constructor{i//2}' for i in range(10)],
-            'Roster Position': ['D'] * 10 + ['CPT'] * 10 + ['CNSTR'] * 10,
-            'TeamAbbrev': ['MERC', 'RBULL', 'FERR', 'MCLA', 'ALPI'] * 6,
-            'Game Info': ['Monaco GP'] * 30,
+        drivers = np.char.add('Driver', np.arange(10).astype(str))
+        driver_points = np.array([50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0])
+        cls.test_data = pd.DataFrame({
+            'ID': np.arange(30),
+            # Regular drivers, captain versions of the same drivers, then constructors
+            'Name': np.concatenate([drivers, drivers, np.char.add('Constructor', (np.arange(10) // 2).astype(str))]),
+            'Roster Position': np.repeat(['D', 'CPT', 'CNSTR'], 10),
+            'TeamAbbrev': np.tile(['MERC', 'RBULL', 'FERR', 'MCLA', 'ALPI'], 6),
+            'Game Info': np.repeat('Monaco GP', 30),
             # Salaries: Regular drivers, captains (higher), constructors
-            'Salary': [8000, 10000, 9000, 7500, 6000, 8500, 7000, 9500, 8800, 7200] + 
-                     [12000, 15000, 13500, 11000, 9000, 12500, 10500, 14000, 13200, 10800] + 
-                     [8000, 12000, 9000, 7000, 6000, 8000, 12000, 9000, 7000, 6000],
-            'AvgPointsPerGame': [50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0] + 
-                               [50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0] + 
-                               [40.0, 70.0, 50.0, 35.0, 30.0, 40.0, 70.0, 50.0, 35.0, 30.0],
+            'Salary': np.array([8000, 10000, 9000, 7500, 6000, 8500, 7000, 9500, 8800, 7200,
+                                12000, 15000, 13500, 11000, 9000, 12500, 10500, 14000, 13200, 10800,
+                                8000, 12000, 9000, 7000, 6000, 8000, 12000, 9000, 7000, 6000]),
+            # Captains share the regular drivers' base points
+            'AvgPointsPerGame': np.concatenate([driver_points, driver_points,
+                                                [40.0, 70.0, 50.0, 35.0, 30.0, 40.0, 70.0, 50.0, 35.0, 30.0]]),
         })
 
-        # Create a temporary CSV file for testing
-        self.test_csv_path = 'test_f1_integration.csv'
-        self.test_data.to_csv(self.test_csv_path, index=False)
+        # Temporary directory for the test files (unique per run, so parallel test runs
+        # don't share it), removed as a whole after the tests
+        cls._tmp = tempfile.TemporaryDirectory()
+        
+        # Create a temporary CSV file for the end-to-end test
+        cls.test_csv_path = os.path.join(cls._tmp.name, 'players.csv')
+        cls.test_data.to_csv(cls.test_csv_path, index=False)
 
-    def tearDown(self):
-        """Clean up after each test method."""
-        # Remove temporary files
-        if os.path.exists(self.test_csv_path):
-            os.remove(self.test_csv_path)
-        # Remove any output files created during tests
-        test_output_files = [
-            'test_output_lineups.csv',
-            'optimized_lineups.csv'
-        ]
-        for filename in test_output_files:
-            if os.path.exists(filename):
-                os.remove(filename)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all test methods."""
+        cls._tmp.cleanup()
 
     def test_basic_to_advanced_optimizer_consistency(self):
         """Test that basic and advanced optimizers produce consistent results."""
         # Initialize both optimizers with the same data
-        basic_optimizer = LineupOptimizer(self.test_csv_path)
-        advanced_optimizer = AdvancedLineupOptimizer(self.test_csv_path)
+        basic_optimizer = LineupOptimizer(self.test_data, solver=TEST_SOLVER)
+        advanced_optimizer = AdvancedLineupOptimizer(self.test_data, solver=TEST_SOLVER)
         
-        # Generate lineups with both optimizers
+        # Generate lineups with both optimizers; the basic lineup is a MIP start for the advanced model
         basic_lineups = basic_optimizer.optimize(num_lineups=1)
-        advanced_lineups = advanced_optimizer.optimize(num_lineups=1)
+        basic_ids = [player['id'] for player in basic_lineups[0]['players']]
+        # Record the solver and the initial values (set with setInitialValue) of each solve
+        solves = []
+        solve = plp.LpProblem.solve
+        def record_solve(prob, solver=None, **kwargs):
+            solves.append((solver, [int(var.name[len('player_'):]) for var in prob.variables()
+                                    if var.name.startswith('player_') and var.varValue == 1]))
+            return solve(prob, solver, **kwargs)
+        with patch.object(plp.LpProblem, 'solve', autospec=True, side_effect=record_solve):
+            advanced_lineups = advanced_optimizer.optimize(num_lineups=1, initial_lineup=basic_ids)
+        
+        # The basic lineup reached a solver that takes MIP starts
+        solver, seeded_ids = solves[0]
+        self.assertTrue(solver.optionsDict.get('warmStart'))
+        self.assertCountEqual(seeded_ids, basic_ids)
         
         # Verify that both produced a lineup
         self.assertEqual(len(basic_lineups), 1)
@@ -100,7 +108,8 @@ class TestF1OptimizerIntegration(unittest.TestCase):
         optimizer = AdvancedLineupOptimizer(
             self.test_csv_path,
             max_from_team=3,
-            min_teams=2
+            min_teams=2,
+            solver=TEST_SOLVER
         )
         
         # Generate multiple lineups with different constraints
@@ -137,22 +146,18 @@ class TestF1OptimizerIntegration(unittest.TestCase):
             self.assertGreaterEqual(len(merc_drivers), 2)
             
             # Check that no driver appears both as captain and regular
-            captain_name = next(p['name'] for p in lineup['players'] if p['position'] == 'CPT')
-            regular_drivers = [p['name'] for p in lineup['players'] if p['position'] == 'D']
+            captain_name = lineup['by_position']['CPT']['name']
+            regular_drivers = [p['name'] for p in lineup['by_position']['D']]
             self.assertNotIn(captain_name, regular_drivers)
             
             # Check team distribution
-            team_counts = {}
-            for player in lineup['players']:
-                team = player['team']
-                team_counts[team] = team_counts.get(team, 0) + 1
-            
-            for team, count in team_counts.items():
+            self.assertEqual(sum(lineup['by_team'].values()), 6)
+            for team, count in lineup['by_team'].items():
                 self.assertLessEqual(count, 3)  # max_from_team=3
 
     def test_multiple_lineup_diversity(self):
         """Test that multiple lineups have appropriate diversity."""
-        optimizer = AdvancedLineupOptimizer(self.test_csv_path)
+        optimizer = AdvancedLineupOptimizer(self.test_data, solver=TEST_SOLVER)
         
         # Generate lineups with high diversity requirement
         lineups = optimizer.optimize(num_lineups=3, lineup_diversity=4)
@@ -169,21 +174,18 @@ class TestF1OptimizerIntegration(unittest.TestCase):
 
     def test_captain_point_calculation(self):
         """Test that captain points are calculated correctly (1.5x)."""
-        optimizer = LineupOptimizer(self.test_csv_path)
+        optimizer = LineupOptimizer(self.test_data, solver=TEST_SOLVER)
         lineups = optimizer.optimize(num_lineups=1)
         
         # Find the captain in the lineup
-        captain = next(p for p in lineups[0]['players'] if p['position'] == 'CPT')
+        captain = lineups[0]['by_position']['CPT']
         
         # Find the corresponding regular driver in our test data
         captain_name = captain['name']
-        regular_driver = self.test_data[
-            (self.test_data['Name'] == captain_name) & 
-            (self.test_data['Roster Position'] == 'D')
-        ]
+        regular_row = optimizer._row_by_name_pos.get((captain_name, 'D'))
         
-        if not regular_driver.empty:
-            regular_points = regular_driver.iloc[0]['AvgPointsPerGame']
+        if regular_row is not None:
+            regular_points = optimizer.players_df['AvgPointsPerGame'].iat[regular_row]
             # Captain should get 1.5x the regular points
             expected_captain_points = regular_points * 1.5
             self.assertAlmostEqual(captain['points'], expected_captain_points)
@@ -191,18 +193,13 @@ class TestF1OptimizerIntegration(unittest.TestCase):
     def test_output_file_generation(self):
         """Test that output files are generated correctly."""
         # Create an optimizer
-        optimizer = AdvancedLineupOptimizer(self.test_csv_path)
+        optimizer = AdvancedLineupOptimizer(self.test_data, solver=TEST_SOLVER)
         
         # Generate lineups and save to file
         lineups = optimizer.optimize(num_lineups=3)
         
-        # Create a test directory for output
-        test_output_dir = os.path.join(os.getcwd(), 'test_output')
-        if not os.path.exists(test_output_dir):
-            os.makedirs(test_output_dir)
-        
         # Save to CSV with full path to avoid using Outputs directory
-        output_file = os.path.join(test_output_dir, 'test_output_lineups.csv')
+        output_file = os.path.join(self._tmp.name, 'test_output_lineups.csv')
         optimizer.save_lineups_to_csv(lineups, output_file)
         
         # Check that the file was created
@@ -219,10 +216,6 @@ class TestF1OptimizerIntegration(unittest.TestCase):
         expected_columns = ['Lineup', 'Position', 'Name', 'Team', 'Salary', 'Avg Points']
         for col in expected_columns:
             self.assertIn(col, df.columns)
-            
-        # Clean up
-        os.remove(output_file)
-        os.rmdir(test_output_dir)
 
 
 if __name__ == '__main__':
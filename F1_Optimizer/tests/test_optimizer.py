@@ -7,47 +7,49 @@ including data loading, constraints enforcement, and lineup generation.
 """
 
 import os
-import sys
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
-from unittest.mock import patch, MagicMock
+import pulp as plp
+from unittest.mock import patch
 
-# Add the parent directory to the path so we can import the optimizer modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from optimizer import LineupOptimizer
+from tests.helpers import TEST_SOLVER
 
 
 class TestF1LineupOptimizer(unittest.TestCase):
     """Test cases for the basic F1 lineup optimizer."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures once for all test methods."""
         # Create a sample test CSV data for the optimizer with F1 drivers and constructors
-        self.test_data = pd.DataFrame({
-            'ID': list(range(20)),
-            'Name': [f'Driver{i}' for i in range(10)] + [f'Constructor{i}' for i in range(10)],
-            'Roster Position': ['D', 'CPT', 'D', 'D', 'CPT', 'D', 'D', 'D', 'CPT', 'D'] + ['CNSTR'] * 10,
-            'TeamAbbrev': ['MERC', 'RBULL', 'FERR', 'MCLA', 'ALPI'] * 4,
-            'Game Info': ['Monaco GP'] * 20,
-            'Salary': [12000, 15000, 10000, 8000, 9000, 7500, 6000, 5000, 11000, 9500] + 
-                      [8000, 12000, 9000, 7000, 6000, 5000, 7500, 8500, 9500, 10500],
-            'AvgPointsPerGame': [50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0] + 
-                                [40.0, 70.0, 50.0, 35.0, 30.0, 25.0, 45.0, 55.0, 60.0, 65.0],
+        index = np.arange(10).astype(str)
+        cls.test_data = pd.DataFrame({
+            'ID': np.arange(20),
+            'Name': np.concatenate([np.char.add('Driver', index), np.char.add('Constructor', index)]),
+            'Roster Position': np.concatenate([['D', 'CPT', 'D', 'D', 'CPT', 'D', 'D', 'D', 'CPT', 'D'],
+                                               np.repeat('CNSTR', 10)]),
+            'TeamAbbrev': np.tile(['MERC', 'RBULL', 'FERR', 'MCLA', 'ALPI'], 4),
+            'Game Info': np.repeat('Monaco GP', 20),
+            'Salary': np.array([12000, 15000, 10000, 8000, 9000, 7500, 6000, 5000, 11000, 9500,
+                                8000, 12000, 9000, 7000, 6000, 5000, 7500, 8500, 9500, 10500]),
+            'AvgPointsPerGame': np.array([50.0, 65.0, 45.0, 40.0, 55.0, 35.0, 30.0, 25.0, 60.0, 42.0,
+                                          40.0, 70.0, 50.0, 35.0, 30.0, 25.0, 45.0, 55.0, 60.0, 65.0]),
         })
 
-        # Create a temporary CSV file for testing
-        self.test_csv_path = 'test_f1_players.csv'
-        self.test_data.to_csv(self.test_csv_path, index=False)
+        # Initialize the optimizer with the test data; optimize() doesn't change its state,
+        # so all tests can share it
+        cls.optimizer = LineupOptimizer(cls.test_data, salary_cap=50000, solver=TEST_SOLVER)
         
-        # Initialize the optimizer with the test data
-        self.optimizer = LineupOptimizer(self.test_csv_path, salary_cap=50000)
+        # Temporary directory for tests that need a CSV file, removed as a whole after the tests
+        cls._tmp = tempfile.TemporaryDirectory()
 
-    def tearDown(self):
-        """Clean up after each test method."""
-        # Remove the temporary CSV file
-        if os.path.exists(self.test_csv_path):
-            os.remove(self.test_csv_path)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all test methods."""
+        cls._tmp.cleanup()
 
     def test_init(self):
         """Test the initialization of the LineupOptimizer class."""
@@ -57,6 +59,15 @@ class TestF1LineupOptimizer(unittest.TestCase):
             'CPT': 1, 'D': 4, 'CNSTR': 1
         })
 
+    def test_make_solver(self):
+        """Test solver selection and the CBC fallback."""
+        cbc_optimizer = LineupOptimizer(self.test_data, solver_name='CBC')
+        self.assertIsInstance(cbc_optimizer._make_solver(), plp.PULP_CBC_CMD)
+        
+        # Without highspy the optimizer should fall back to CBC
+        with patch('pulp.HiGHS.available', return_value=False):
+            self.assertIsInstance(self.optimizer._make_solver(), plp.PULP_CBC_CMD)
+
     def test_data_loading(self):
         """Test that player data is loaded correctly."""
         # Check that the data was loaded properly
@@ -74,6 +85,17 @@ class TestF1LineupOptimizer(unittest.TestCase):
         driver1 = self.optimizer.players_df[self.optimizer.players_df['Name'] == 'Driver1'].iloc[0]
         self.assertEqual(driver1['CaptainPoints'], driver1['AvgPointsPerGame'] * 1.5)
 
+    def test_data_loading_cache(self):
+        """Test that cached CSV data is not shared between optimizers."""
+        csv_path = os.path.join(self._tmp.name, 'players.csv')
+        self.test_data.to_csv(csv_path, index=False)
+        
+        other_optimizer = LineupOptimizer(csv_path)
+        other_optimizer.players_df.loc[0, 'Salary'] = 1
+        
+        self.assertEqual(self.optimizer.players_df.loc[0, 'Salary'], 12000)
+        self.assertEqual(LineupOptimizer(csv_path).players_df.loc[0, 'Salary'], 12000)
+
     def test_optimize_single_lineup(self):
         """Test generating a single optimized lineup."""
         lineups = self.optimizer.optimize(num_lineups=1)
@@ -117,39 +139,47 @@ class TestF1LineupOptimizer(unittest.TestCase):
                 # There should be at most 4 common players (at least 2 different)
                 self.assertLessEqual(len(common_players), 4)
 
+    def test_one_solve_per_lineup(self):
+        """Test that each lineup takes a single solve of the model."""
+        num_lineups = 10
+        with patch.object(plp.LpProblem, 'solve', autospec=True, side_effect=plp.LpProblem.solve) as mock_solve:
+            lineups = self.optimizer.optimize(num_lineups=num_lineups)
+        
+        self.assertEqual(len(lineups), num_lineups)
+        self.assertEqual(mock_solve.call_count, num_lineups)
+
+    def test_parallel_lineups(self):
+        """Test that solving captains in parallel gives the same lineups as solving sequentially."""
+        sequential = self.optimizer.optimize(num_lineups=3)
+        parallel = self.optimizer.optimize(num_lineups=3, jobs=2)
+        
+        self.assertEqual(len(parallel), len(sequential))
+        for parallel_lineup, sequential_lineup in zip(parallel, sequential):
+            self.assertAlmostEqual(parallel_lineup['total_points'], sequential_lineup['total_points'])
+
     def test_captain_constraint(self):
         """Test that a driver cannot be both a captain and regular driver."""
         lineups = self.optimizer.optimize(num_lineups=1)
-        
-        # Get all drivers in the lineup
-        captain = None
-        regular_drivers = []
-        
-        for player in lineups[0]['players']:
-            if player['position'] == 'CPT':
-                captain = player['name']
-            elif player['position'] == 'D':
-                regular_drivers.append(player['name'])
+        by_position = lineups[0]['by_position']
         
         # Check that the captain doesn't also appear as a regular driver
-        self.assertNotIn(captain, regular_drivers)
+        regular_drivers = [player['name'] for player in by_position['D']]
+        self.assertEqual(len(regular_drivers), 4)
+        self.assertNotIn(by_position['CPT']['name'], regular_drivers)
 
     def test_salary_cap_constraint(self):
         """Test that the salary cap constraint is enforced."""
         # Create a new optimizer with a very low salary cap
-        low_cap_optimizer = LineupOptimizer(self.test_csv_path, salary_cap=10000)
-        
-        # Try to optimize with the low cap
-        with patch('pulp.LpProblem.solve') as mock_solve:
-            # Mock the solve method to always return 'Infeasible'
-            mock_solve.return_value = 1  # 1 is the code for 'Not Solved'
-            mock_status = MagicMock()
-            mock_status.__getitem__.return_value = 'Infeasible'
-            with patch('pulp.LpStatus', mock_status):
-                lineups = low_cap_optimizer.optimize(num_lineups=1)
-                
-                # Should get an empty list if no solution is found
-                self.assertEqual(lineups, [])
+        low_cap_optimizer = LineupOptimizer(self.test_data, salary_cap=10000, solver=TEST_SOLVER)
+        
+        # The cheapest valid roster costs more than the cap, so this is caught before
+        # the model is built or solved
+        self.assertTrue(low_cap_optimizer._is_trivially_infeasible())
+        self.assertFalse(self.optimizer._is_trivially_infeasible())
+        
+        # Should get an empty list if no solution is found
+        lineups = low_cap_optimizer.optimize(num_lineups=1)
+        self.assertEqual(lineups, [])
 
     def test_output_formatting(self):
         """Test that the lineup output is formatted correctly."""
@@ -30,23 +30,29 @@ For best results, make sure your injury file has "injury", "injured", or "IL" in
 
 import os
 import csv
+import numpy as np
 import pandas as pd
 import pulp as plp
 from typing import List, Dict, Tuple, Set, Optional
-from collections import defaultdict
+from collections import Counter
 import argparse
 
 
 class AdvancedLineupOptimizer:
     """Advanced class for optimizing Daily Fantasy Baseball lineups with additional features."""
 
+    # Order in which positions are listed within a lineup
+    _POSITION_ORDER = {'P': 0, 'C': 1, '1B': 2, '2B': 3, '3B': 4, 'SS': 5, 'OF': 6}
+
     def __init__(
         self, 
         csv_path: str, 
         salary_cap: int = 50000,
         max_players_from_team: int = 5,
         min_teams: int = 3,
-        injured_list_path: Optional[str] = None
+        injured_list_path: Optional[str] = None,
+        solver_name: str = 'HiGHS',
+        time_limit: Optional[int] = None
     ):
         """
         Initialize the lineup optimizer with player data and constraints.
@@ -57,10 +63,14 @@ class AdvancedLineupOptimizer:
             max_players_from_team: Maximum number of players allowed from a single team
             min_teams: Minimum number of different teams that must be represented in a lineup
             injured_list_path: Optional path to CSV file containing injured players
+            solver_name: MIP solver to use ('HiGHS' or 'CBC'); falls back to CBC if HiGHS is unavailable
+            time_limit: Optional time limit in seconds for each lineup solve
         """
         self.salary_cap = salary_cap
         self.max_players_from_team = max_players_from_team
         self.min_teams = min_teams
+        self.solver_name = solver_name
+        self.time_limit = time_limit
         self.players_df = self._load_data(csv_path)
         
         # If injured list is provided, filter out injured players
@@ -79,6 +89,35 @@ class AdvancedLineupOptimizer:
             'SS': 1,
             'OF': 3
         }
+        
+        # Player attributes as NumPy arrays, extracted once (after injury filtering) for
+        # building the model instead of iterating over the DataFrame rows
+        self._ids = self.players_df['ID'].to_numpy()
+        self._salaries = self.players_df['Salary'].to_numpy()
+        self._points = self.players_df['AvgPointsPerGame'].to_numpy()
+        self._positions = self.players_df['Roster Position'].to_numpy()
+        self._position_rank = (self.players_df['Roster Position'].map(self._POSITION_ORDER)
+                               .fillna(len(self._POSITION_ORDER)).to_numpy(dtype=np.int64))
+        
+        # Team -> opponent mapping; the games don't change for the session
+        self.opponents_dict = self._extract_opponents()
+        
+        # Player rows indexed by ID for looking up the selected players
+        self._by_id = self.players_df.set_index('ID', drop=False).sort_index()
+        
+        # Row indices of each team's players
+        # (a single groupby pass rather than one mask per team)
+        self._team_to_indices = dict(self.players_df.groupby('TeamAbbrev', sort=False, dropna=False).indices)
+        
+        # Row indices of the players eligible for each required position
+        self._pos_to_indices = {position: np.flatnonzero(self._positions == position).tolist()
+                                for position in self.required_positions}
+        
+        # Row indices of interchangeable players (same position, team, salary and points),
+        # used to break symmetry in the model
+        groups = self.players_df.groupby(['Roster Position', 'TeamAbbrev', 'Salary', 'AvgPointsPerGame'],
+                                         sort=False).indices
+        self._symmetric_groups = [indices for indices in groups.values() if len(indices) > 1]
 
     def _load_data(self, csv_path: str) -> pd.DataFrame:
         """
@@ -146,14 +185,10 @@ class AdvancedLineupOptimizer:
             
             print(f"Found {len(injured_players)} players on the injury list")
             
-            # Check if a player's name is in the injured list
-            def is_not_injured(player_name):
-                # Handle variations in name formatting
-                name = player_name.strip()
-                return name not in injured_players
-            
             # Filter the players dataframe to exclude injured players
-            self.players_df = self.players_df[self.players_df['Name'].apply(is_not_injured)]
+            # (names are stripped to handle variations in name formatting)
+            is_not_injured = ~self.players_df['Name'].str.strip().isin(injured_players)
+            self.players_df = self.players_df.loc[is_not_injured].reset_index(drop=True)
             
             filtered_count = initial_player_count - len(self.players_df)
             print(f"Filtered out {filtered_count} injured players from the player pool.")
@@ -171,19 +206,171 @@ class AdvancedLineupOptimizer:
         Returns:
             Dictionary mapping teams to their opponents
         """
-        opponents = {}
         games = {}
         
-        # First, collect all game information
-        for _, row in self.players_df.iterrows():
-            if '@' in row['Game Info']:
-                game_info = row['Game Info'].split(' ')[0]  # Get "TEAM1@TEAM2" part
-                team1, team2 = game_info.split('@')
-                games[team1] = team2
-                games[team2] = team1
+        # Get the "TEAM1@TEAM2" part of each game's information
+        matchups = self.players_df['Game Info'].str.split(' ', n=1).str[0]
+        matchups = matchups[matchups.str.contains('@', regex=False, na=False)].drop_duplicates()
+        if matchups.empty:
+            return games
+        
+        pairs = matchups.str.split('@', n=1, expand=True)
+        games.update(zip(pairs[0], pairs[1]))
+        games.update(zip(pairs[1], pairs[0]))
                 
         return games
 
+    def _make_solver(self, threads: Optional[int] = None) -> plp.LpSolver:
+        """
+        Create the solver used for each lineup solve.
+        
+        Prefers the HiGHS command-line solver and falls back to the CBC solver bundled
+        with PuLP when HiGHS isn't installed. Both are created with warmStart so that each
+        solve starts from the current variable values (the previous lineup), and run
+        their branch and bound on several threads.
+        
+        Args:
+            threads: Number of solver threads (default: all CPUs but one)
+        
+        Returns:
+            A configured PuLP solver instance
+        """
+        if threads is None:
+            threads = max(1, (os.cpu_count() or 1) - 1)
+        
+        if self.solver_name.lower() == 'highs':
+            solver = plp.HiGHS_CMD(msg=False, timeLimit=self.time_limit, warmStart=True, threads=threads)
+            if solver.available():
+                return solver
+        
+        return plp.PULP_CBC_CMD(msg=False, timeLimit=self.time_limit, warmStart=True, threads=threads)
+
+    def _solve_lineup(
+        self,
+        prob: plp.LpProblem,
+        solver: plp.LpSolver,
+        player_vars: Dict[int, plp.LpVariable],
+        team_vars: Dict[str, plp.LpVariable],
+        relax_first: bool = True
+    ) -> Tuple[str, bool]:
+        """
+        Solve the lineup model, optionally trying its LP relaxation first.
+        
+        The position and team rows are close to totally unimodular, so the LP relaxation
+        can pick whole players. In that case its solution is optimal for the MIP as well
+        and branch and bound is skipped.
+        
+        Args:
+            prob: Lineup problem to solve
+            solver: PuLP solver to use
+            player_vars: Binary player variables keyed by ID
+            team_vars: Binary team variables keyed by team
+            relax_first: Whether to try the LP relaxation before the MIP
+            
+        Returns:
+            Tuple of the solve status ('Optimal' if a lineup was found) and whether
+            the LP relaxation gave the lineup
+        """
+        if not relax_first:
+            prob.solve(solver)
+            return plp.LpStatus[prob.status], False
+        
+        binary_vars = list(player_vars.values()) + list(team_vars.values())
+        for var in binary_vars:
+            var.cat = plp.LpContinuous
+        try:
+            prob.solve(solver)
+        finally:
+            for var in binary_vars:
+                var.cat = plp.LpInteger
+        
+        if plp.LpStatus[prob.status] == 'Optimal' and all(
+                abs(var.varValue - round(var.varValue)) < 1e-6 for var in player_vars.values()):
+            # Team indicators may be fractional; with whole players every team that has
+            # a selected player can take the value 1
+            for team_var in team_vars.values():
+                team_var.varValue = 1 if team_var.varValue > 1e-6 else 0
+            return 'Optimal', True
+        
+        prob.solve(solver)
+        return plp.LpStatus[prob.status], False
+
+    def _build_base_model(
+        self,
+        stack_team: Optional[str],
+        stack_count: int,
+        min_salary_used: float,
+        break_symmetry: bool = True
+    ) -> Tuple[plp.LpProblem, Dict[int, plp.LpVariable], Dict[str, plp.LpVariable]]:
+        """
+        Build the lineup model with the objective and the constraints shared by every lineup.
+        
+        Args:
+            stack_team: Team abbreviation to stack (if desired)
+            stack_count: Number of players to include from stacked team
+            min_salary_used: Minimum fraction of salary cap that must be used
+            break_symmetry: Add the symmetry rows for interchangeable players; only valid
+                while their objective coefficients are equal
+            
+        Returns:
+            Tuple of the problem, the player variables keyed by ID and the team variables
+        """
+        prob = plp.LpProblem("DFS_Lineup", plp.LpMaximize)
+
+        # Create a binary variable for each player (in row order, so they line up with the arrays)
+        vars_arr = [plp.LpVariable(f"p{player_id}", cat='Binary') for player_id in self._ids.tolist()]
+        player_vars = dict(zip(self._ids.tolist(), vars_arr))
+
+        # Create binary variables for each team (1 if any player from that team is selected)
+        team_vars = {team: plp.LpVariable(f"team_{team}", cat='Binary') 
+                    for team in self.teams}
+
+        # Objective function: Maximize total average points
+        prob += plp.LpAffineExpression(zip(vars_arr, self._points.tolist()))
+
+        # The salary expression is shared by the salary cap and minimum salary constraints
+        salary_expr = plp.LpAffineExpression(zip(vars_arr, self._salaries.tolist()))
+
+        # Constraint 1: Salary cap
+        prob += salary_expr <= self.salary_cap
+
+        # Constraint 2: Minimum salary used
+        prob += salary_expr >= self.salary_cap * min_salary_used
+
+        # Constraint 3: Position requirements
+        for position, count in self.required_positions.items():
+            prob += plp.lpSum(vars_arr[idx] for idx in self._pos_to_indices[position]) == count
+
+        # Constraint 4: Exactly 10 players in total
+        prob += plp.lpSum(vars_arr) == sum(self.required_positions.values())
+
+        # Constraints 5 and 6: Link team_vars to the players selected from each team
+        # and cap the players from one team (big-M with M = max_players_from_team)
+        for team, indices in self._team_to_indices.items():
+            team_expr = plp.LpAffineExpression((vars_arr[idx], 1) for idx in indices.tolist())
+            
+            # If no players from this team are selected, team_var must be 0
+            prob += team_expr >= team_vars[team]
+            
+            # If any player from this team is selected, team_var must be 1
+            prob += team_expr <= self.max_players_from_team * team_vars[team]
+
+        # Constraint 7: Minimum teams represented
+        prob += plp.lpSum(team_vars.values()) >= self.min_teams
+
+        # Constraint 8: Team stacking if requested
+        if stack_team and stack_team in self.teams:
+            prob += plp.lpSum(vars_arr[idx] for idx in self._team_to_indices[stack_team].tolist()) >= stack_count
+        
+        # Symmetry breaking: interchangeable players are picked in row order, so the
+        # solver doesn't branch over lineups that only swap them
+        if break_symmetry:
+            for group, indices in enumerate(self._symmetric_groups):
+                for k, (first, second) in enumerate(zip(indices[:-1].tolist(), indices[1:].tolist())):
+                    prob += vars_arr[first] >= vars_arr[second], f"symmetry_{group}_{k}"
+        
+        return prob, player_vars, team_vars
+
     def optimize(
         self, 
         num_lineups: int = 10, 
@@ -191,11 +378,18 @@ class AdvancedLineupOptimizer:
         stack_count: int = 4,
         min_salary_used: float = 0.95,
         lineup_diversity: int = 3,
-        max_player_appearances: Optional[int] = None
+        max_player_appearances: Optional[int] = None,
+        perturbation: float = 0.0,
+        random_seed: Optional[int] = None
     ) -> List[Dict]:
         """
         Generate optimized lineups with advanced constraints.
         
+        By default each lineup is the best one that differs from all previous lineups by
+        lineup_diversity players. With a perturbation, each lineup after the first maximizes
+        randomly perturbed projections instead, and the uniqueness cuts are only added for
+        previous lineups that the new one turns out to be too close to.
+        
         Args:
             num_lineups: Number of different lineups to generate
             stack_team: Team abbreviation to stack (if desired)
@@ -203,105 +397,104 @@ class AdvancedLineupOptimizer:
             min_salary_used: Minimum fraction of salary cap that must be used
             lineup_diversity: Minimum number of different players between lineups
             max_player_appearances: Maximum number of times a player can appear across all lineups
+            perturbation: Maximum relative change to each player's projection for lineups after
+                the first (e.g. 0.05 for +/-5%); 0 solves every lineup with the actual projections
+            random_seed: Seed for the perturbations
             
         Returns:
             List of dictionaries, each containing a lineup with player details
         """
         lineups = []
-        opponents_dict = self._extract_opponents()
+        opponents_dict = self.opponents_dict
         previous_lineups_players = []
         
         # Keep track of how many times each player appears across lineups
         player_appearances = {player_id: 0 for player_id in self.players_df['ID'].values}
         
+        # Build the model once; only the appearance limits and uniqueness cuts
+        # change between lineups, so those are applied to it in the loop below.
+        # Perturbed projections make tied players differ, so they get no symmetry rows
+        prob, player_vars, team_vars = self._build_base_model(stack_team, stack_count, min_salary_used,
+                                                              break_symmetry=perturbation <= 0)
+        symmetric_groups = dict(enumerate(self._symmetric_groups)) if perturbation <= 0 else {}
+        vars_arr = list(player_vars.values())
+        rng = np.random.default_rng(random_seed)
+        
+        solver = self._make_solver()
+        
+        # Try the LP relaxation until it first comes back fractional (usually because of
+        # the salary rows); after that it would only add a second solve per lineup
+        relax_first = True
+        
         for i in range(num_lineups):
-            # Create a new linear programming problem
-            prob = plp.LpProblem(f"DFS_Lineup_{i+1}", plp.LpMaximize)
-            
-            # Create a binary variable for each player
-            player_vars = {row['ID']: plp.LpVariable(f"player_{row['ID']}", cat='Binary') 
-                           for _, row in self.players_df.iterrows()}
-            
-            # Create binary variables for each team (1 if any player from that team is selected)
-            team_vars = {team: plp.LpVariable(f"team_{team}", cat='Binary') 
-                        for team in self.teams}
-            
-            # Objective function: Maximize total average points
-            prob += plp.lpSum(row['AvgPointsPerGame'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows())
-            
-            # Constraint 1: Salary cap
-            prob += plp.lpSum(row['Salary'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows()) <= self.salary_cap
-            
-            # Constraint 2: Minimum salary used
-            prob += plp.lpSum(row['Salary'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows()) >= self.salary_cap * min_salary_used
-            
-            # Constraint 3: Position requirements
-            for position, count in self.required_positions.items():
-                prob += plp.lpSum(player_vars[row['ID']] 
-                                 for _, row in self.players_df.iterrows() 
-                                 if row['Roster Position'] == position) == count
-            
-            # Constraint 4: Exactly 10 players in total
-            prob += plp.lpSum(player_vars.values()) == sum(self.required_positions.values())
-            
-            # Constraint 5: Team constraints (connect player_vars to team_vars)
-            for team in self.teams:
-                # If any player from this team is selected, team_var must be 1
-                team_players = self.players_df[self.players_df['TeamAbbrev'] == team]
-                for _, player in team_players.iterrows():
-                    prob += player_vars[player['ID']] <= team_vars[team]
-                
-                # If no players from this team are selected, team_var must be 0
-                prob += plp.lpSum(player_vars[player['ID']] for _, player in team_players.iterrows()) >= team_vars[team]
-            
-            # Constraint 6: Maximum players from one team
-            for team in self.teams:
-                team_players = self.players_df[self.players_df['TeamAbbrev'] == team]
-                prob += plp.lpSum(player_vars[player['ID']] for _, player in team_players.iterrows()) <= self.max_players_from_team
-            
-            # Constraint 7: Minimum teams represented
-            prob += plp.lpSum(team_vars.values()) >= self.min_teams
-            
-            # Constraint 8: Team stacking if requested
-            if stack_team and stack_team in self.teams:
-                stack_team_players = self.players_df[self.players_df['TeamAbbrev'] == stack_team]
-                prob += plp.lpSum(player_vars[player['ID']] for _, player in stack_team_players.iterrows()) >= stack_count
-            
             # Constraint 9: Limit on player appearances across lineups
             if max_player_appearances is not None:
                 excluded_count = 0
                 for player_id, appearances in player_appearances.items():
                     if appearances >= max_player_appearances:
                         # If player has reached maximum allowed appearances, exclude them from this lineup
-                        prob += player_vars[player_id] == 0
+                        player_vars[player_id].upBound = 0
                         excluded_count += 1
                 
                 if excluded_count > 0 and i > 0:  # Only print for second lineup onwards
                     print(f"Lineup {i+1}: Excluded {excluded_count} players who reached the max appearance limit of {max_player_appearances}")
             
-            # Constraint 10: Ensure uniqueness from previous lineups
-            for prev_lineup in previous_lineups_players:
-                # New lineup must differ from each previous lineup by at least lineup_diversity players
-                prob += plp.lpSum(player_vars[player_id] for player_id in prev_lineup) <= len(prev_lineup) - lineup_diversity
+            # Give each lineup after the first its own perturbed projections
+            if perturbation > 0 and i > 0:
+                noise = rng.uniform(-perturbation, perturbation, size=len(vars_arr))
+                prob.setObjective(plp.LpAffineExpression(zip(vars_arr, (self._points * (1 + noise)).tolist())))
             
-            # Solve the problem
-            prob.solve(plp.PULP_CBC_CMD(msg=False))
+            while True:
+                # Solve the problem
+                status, relax_first = self._solve_lineup(prob, solver, player_vars, team_vars, relax_first)
+                if status != 'Optimal':
+                    break
+                
+                # Extract the selected players
+                # (threshold the solution values, which can be off by the solver's tolerance)
+                selected_mask = np.fromiter((var.varValue > 0.5 for var in vars_arr),
+                                            dtype=bool, count=len(vars_arr))
+                selected_player_ids = self._ids[selected_mask].tolist()
+                if perturbation <= 0:
+                    break
+                
+                # Add the uniqueness cuts (Constraint 10) of any previous lineups this one is
+                # too close to and solve again
+                selected_set = set(selected_player_ids)
+                too_close = [prev_lineup for prev_lineup in previous_lineups_players
+                             if len(selected_set.intersection(prev_lineup)) > len(prev_lineup) - lineup_diversity]
+                if not too_close:
+                    break
+                for prev_lineup in too_close:
+                    prob += plp.lpSum(player_vars[player_id] for player_id in prev_lineup) <= len(prev_lineup) - lineup_diversity
             
             # Check if a solution was found
-            if plp.LpStatus[prob.status] != 'Optimal':
+            if status != 'Optimal':
                 print(f"Could not find optimal solution for lineup {i+1}")
                 if i == 0:  # First lineup must be successful
                     return []
                 break
                 
-            # Extract the selected players
-            selected_player_ids = [int(p_id) for p_id, var in player_vars.items() 
-                                 if plp.value(var) == 1]
             previous_lineups_players.append(selected_player_ids)
             
+            if perturbation > 0:
+                # Only forbid repeating this lineup; its uniqueness cut is added if a later
+                # lineup comes too close to it
+                prob += plp.lpSum(player_vars[player_id] for player_id in selected_player_ids) <= len(selected_player_ids) - 1
+            else:
+                # Constraint 10: Ensure uniqueness from previous lineups
+                # Next lineup must differ from this one by at least lineup_diversity players
+                prob += plp.lpSum(player_vars[player_id] for player_id in selected_player_ids) <= len(selected_player_ids) - lineup_diversity
+            
+            # Players of a group are no longer interchangeable once some of them are in a
+            # uniqueness cut (or reach the appearance limit), so relax that group's symmetry
+            # rows to x_first - x_second >= -1, which always holds
+            for group, indices in list(symmetric_groups.items()):
+                if selected_mask[indices].any():
+                    for k in range(len(indices) - 1):
+                        prob.get_constraint_by_name(f"symmetry_{group}_{k}").changeRHS(-1)
+                    del symmetric_groups[group]
+            
             # Update player appearance counts
             for player_id in selected_player_ids:
                 player_appearances[player_id] += 1
@@ -314,8 +507,13 @@ class AdvancedLineupOptimizer:
                 'teams_used': set()
             }
             
-            for player_id in selected_player_ids:
-                player = self.players_df[self.players_df['ID'] == player_id].iloc[0]
+            # List the players by position in the required order, then by points (highest first)
+            selected_idx = np.flatnonzero(selected_mask)
+            lineup_order = selected_idx[np.lexsort((-self._points[selected_idx],
+                                                    self._position_rank[selected_idx]))]
+            
+            for player_id in self._ids[lineup_order].tolist():
+                player = self._by_id.loc[player_id]
                 opponent = opponents_dict.get(player['TeamAbbrev'], "Unknown")
                 
                 lineup_data['players'].append({
@@ -333,10 +531,6 @@ class AdvancedLineupOptimizer:
                 lineup_data['total_points'] += player['AvgPointsPerGame']
                 lineup_data['teams_used'].add(player['TeamAbbrev'])
             
-            # Sort players by position in the required order
-            position_order = {'P': 0, 'C': 1, '1B': 2, '2B': 3, '3B': 4, 'SS': 5, 'OF': 6}
-            lineup_data['players'].sort(key=lambda x: (position_order[x['position']], -x['avg_points']))
-            
             lineups.append(lineup_data)
         
         # Sort lineups by total points in descending order
@@ -350,19 +544,20 @@ class AdvancedLineupOptimizer:
         Args:
             lineups: List of lineup dictionaries
         """
+        separator = '-' * 80
+        header = f"{'POS':<5}{'NAME':<30}{'TEAM':<6}{'OPP':<6}{'SALARY':<10}{'POINTS':<10}{'GAME INFO':<20}"
+        
         for i, lineup in enumerate(lineups, 1):
             print(f"\n{'='*80}")
             print(f"LINEUP #{i} - Total Points: {lineup['total_points']:.2f} - "
                   f"Total Salary: ${lineup['total_salary']} - "
                   f"Teams Used: {len(lineup['teams_used'])}")
-            print(f"{'-'*80}")
-            print(f"{'POS':<5}{'NAME':<30}{'TEAM':<6}{'OPP':<6}{'SALARY':<10}{'POINTS':<10}{'GAME INFO':<20}")
-            print(f"{'-'*80}")
+            print(separator)
+            print(header)
+            print(separator)
             
             # Group players by team to see stacks
-            team_counts = defaultdict(int)
-            for player in lineup['players']:
-                team_counts[player['team']] += 1
+            team_counts = Counter(player['team'] for player in lineup['players'])
             
             for player in lineup['players']:
                 team_indicator = f"{player['team']}*" if team_counts[player['team']] >= 3 else player['team']
@@ -403,23 +598,17 @@ class AdvancedLineupOptimizer:
             else:
                 output_path = os.path.join(output_dir, base_name)
         
-        with open(output_path, 'w', newline='') as csvfile:
-            csvwriter = csv.writer(csvfile)
-            csvwriter.writerow(['Lineup', 'Position', 'Name', 'Team', 'Opponent', 
-                               'Salary', 'Avg Points', 'Game Info'])
-            
-            for i, lineup in enumerate(lineups, 1):
-                for player in lineup['players']:
-                    csvwriter.writerow([
-                        i, 
-                        player['position'], 
-                        player['name'], 
-                        player['team'],
-                        player['opponent'],
-                        player['salary'], 
-                        player['avg_points'],
-                        player['game_info']
-                    ])
+        rows = [
+            (i, player['position'], player['name'], player['team'], player['opponent'],
+             player['salary'], player['avg_points'], player['game_info'])
+            for i, lineup in enumerate(lineups, 1)
+            for player in lineup['players']
+        ]
+        columns = ['Lineup', 'Position', 'Name', 'Team', 'Opponent', 
+                   'Salary', 'Avg Points', 'Game Info']
+        
+        # CRLF line endings, as csv.writer produced
+        pd.DataFrame.from_records(rows, columns=columns).to_csv(output_path, index=False, lineterminator='\r\n')
         
         print(f"\nLineups saved to {output_path}")
         
@@ -462,45 +651,46 @@ class AdvancedLineupOptimizer:
         # Define the positions in the order they should appear in the CSV
         positions = ['P', 'P', 'C', '1B', '2B', '3B', 'SS', 'OF', 'OF', 'OF']
         
+        # Build one roster row per lineup
+        roster_rows = []
+        for lineup in lineups:
+            # Create a dictionary to organize players by position
+            players_by_position = {pos: [] for pos in positions}
+            
+            # Sort players into their positions
+            for player in lineup['players']:
+                pos = player['position']
+                if pos in players_by_position:
+                    # Use the stored player ID
+                    player_data = {
+                        'id': player['id'],  # Use the ID we stored when creating the lineup
+                        'avg_points': player['avg_points']
+                    }
+                    players_by_position[pos].append(player_data)
+            
+            # Sort players by average points within each position
+            for pos in players_by_position:
+                if len(players_by_position[pos]) > 0:
+                    players_by_position[pos].sort(key=lambda x: x['avg_points'], reverse=True)
+            
+            # Build the roster row with IDs in the correct position order
+            roster_row = []
+            for pos in positions:
+                if players_by_position[pos] and len(players_by_position[pos]) > 0:
+                    # Take the highest-scoring player for this position
+                    roster_row.append(str(players_by_position[pos].pop(0)['id']))
+                else:
+                    # If no player found for this position (shouldn't happen in a valid lineup)
+                    roster_row.append('')
+            
+            roster_rows.append(roster_row)
+        
         with open(output_path, 'w', newline='') as csvfile:
             csvwriter = csv.writer(csvfile)
             
             # Write the header row
             csvwriter.writerow(positions)
-            
-            # Process each lineup
-            for lineup in lineups:
-                # Create a dictionary to organize players by position
-                players_by_position = {pos: [] for pos in positions}
-                
-                # Sort players into their positions
-                for player in lineup['players']:
-                    pos = player['position']
-                    if pos in players_by_position:
-                        # Use the stored player ID
-                        player_data = {
-                            'id': player['id'],  # Use the ID we stored when creating the lineup
-                            'avg_points': player['avg_points']
-                        }
-                        players_by_position[pos].append(player_data)
-                
-                # Sort players by average points within each position
-                for pos in players_by_position:
-                    if len(players_by_position[pos]) > 0:
-                        players_by_position[pos].sort(key=lambda x: x['avg_points'], reverse=True)
-                
-                # Build the roster row with IDs in the correct position order
-                roster_row = []
-                for pos in positions:
-                    if players_by_position[pos] and len(players_by_position[pos]) > 0:
-                        # Take the highest-scoring player for this position
-                        roster_row.append(str(players_by_position[pos].pop(0)['id']))
-                    else:
-                        # If no player found for this position (shouldn't happen in a valid lineup)
-                        roster_row.append('')
-                
-                # Write the roster row
-                csvwriter.writerow(roster_row)
+            csvwriter.writerows(roster_rows)
         
         print(f"\nLineups saved to {output_path} in position-based format")
     
@@ -516,15 +706,12 @@ class AdvancedLineupOptimizer:
             return
             
         # Count appearances for each player
-        player_usage = defaultdict(int)
+        player_usage = Counter(player['name'] for lineup in lineups for player in lineup['players'])
         player_ids = {}  # To map names to IDs
         
         for lineup in lineups:
             for player in lineup['players']:
-                player_id = player['id']
-                player_name = player['name']
-                player_usage[player_name] += 1
-                player_ids[player_name] = player_id
+                player_ids[player['name']] = player['id']
                 
         # Print summary
         print(f"\n{'='*80}")
@@ -554,8 +741,13 @@ class AdvancedLineupOptimizer:
                 
         print(f"{'='*80}")
 
-def parse_args():
-    """Parse command-line arguments."""
+def parse_args(argv: Optional[List[str]] = None):
+    """
+    Parse command-line arguments.
+    
+    Args:
+        argv: Arguments to parse (default: the command-line arguments)
+    """
     parser = argparse.ArgumentParser(description='Optimize Daily Fantasy Baseball lineups')
     
     parser.add_argument('--csv', type=str, help='Path to the CSV file with player data')
@@ -583,8 +775,16 @@ def parse_args():
                         help='Automatically detect and use the most recent injury list file')
     parser.add_argument('--output', type=str, default='optimized_lineups.csv', 
                         help='Output CSV file name (default: optimized_lineups.csv)')
+    parser.add_argument('--perturbation', type=float, default=0.0,
+                        help='Randomly perturb projections by up to this fraction for each lineup after the first (default: 0)')
+    parser.add_argument('--random-seed', type=int,
+                        help='Seed for the projection perturbations')
+    parser.add_argument('--solver', type=str, default='HiGHS', choices=['HiGHS', 'CBC'],
+                        help='MIP solver to use, falls back to CBC if HiGHS is not installed (default: HiGHS)')
+    parser.add_argument('--time-limit', type=int,
+                        help='Time limit in seconds for each lineup solve')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def find_csv_path(file_pattern="DKSalaries*.csv"):
@@ -742,10 +942,22 @@ def check_injury_files():
     return injury_file
 
 
-def main():
-    """Main function to run the optimization process."""
+def main(argv: Optional[List[str]] = None):
+    """
+    Main function to run the optimization process.
+    
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:]); the prompts are shown when
+            there are none
+    """
     # Parse command-line arguments
-    args = parse_args()
+    args = parse_args(argv)
+    
+    # Ask for customization only when run without arguments
+    if argv is None:
+        interactive = __name__ == "__main__" and len(os.sys.argv) <= 1
+    else:
+        interactive = not argv
     
     # Find CSV path if not provided
     csv_path = args.csv
@@ -842,11 +1054,13 @@ def main():
             salary_cap=args.salary_cap,
             max_players_from_team=args.max_from_team,
             min_teams=args.min_teams,
-            injured_list_path=args.injured_list
+            injured_list_path=args.injured_list,
+            solver_name=args.solver,
+            time_limit=args.time_limit
         )
         
         # Check if running interactively or from command line
-        if __name__ == "__main__" and len(os.sys.argv) <= 1:
+        if interactive:
             # Running interactively, ask for customization
             customize = input("Do you want to customize optimization parameters? (y/n): ").lower()
             if customize == 'y':
@@ -879,7 +1093,9 @@ def main():
             stack_count=args.stack_count,
             min_salary_used=args.min_salary_used,
             lineup_diversity=args.lineup_diversity,
-            max_player_appearances=args.max_player_appearances
+            max_player_appearances=args.max_player_appearances,
+            perturbation=args.perturbation,
+            random_seed=args.random_seed
         )
         
         if not lineups:
@@ -903,7 +1119,7 @@ def main():
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        if __name__ == "__main__" and len(os.sys.argv) <= 1:
+        if interactive:
             # When running interactively, ask if user wants to save
             save_to_csv = input("\nDo you want to save these lineups to CSV files? (y/n): ").lower()
             if save_to_csv == 'y':
@@ -2,26 +2,59 @@
 # This script is optional and for convenience only
 
 import os
+import filecmp
 import shutil
 import time
 from pathlib import Path
 from datetime import datetime
 
+def is_same_file_content(src_file, dest_file):
+    """
+    Check whether dest_file already holds the same data as src_file.
+    
+    Files with the same size and modification time (to the second) are taken as equal.
+    If only the sizes match, the contents are compared byte by byte, and when they are
+    equal the source's timestamps are copied over so the quick check passes next time.
+    
+    Args:
+        src_file: Path to the source file
+        dest_file: Path to the destination file
+        
+    Returns:
+        True if the destination doesn't need to be copied again
+    """
+    try:
+        src_stat = os.stat(src_file)
+        dest_stat = os.stat(dest_file)
+    except FileNotFoundError:
+        return False
+    
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if int(src_stat.st_mtime) == int(dest_stat.st_mtime):
+        return True
+    
+    if filecmp.cmp(src_file, dest_file, shallow=False):
+        shutil.copystat(src_file, dest_file)
+        return True
+    return False
+
 def main():
     """Copy the latest DraftKings salary file from Downloads to the project directory."""
     # Find user's Downloads folder
     downloads_dir = os.path.join(os.path.expanduser("~"), "Downloads")
     
     # Look for all DraftKings salary files and get the most recent one
+    # (a single scandir pass; each entry's stat is reused for its modification time)
     dk_files = []
-    for file in os.listdir(downloads_dir):
-        if file.startswith("DKSalaries") and file.endswith(".csv"):
-            file_path = os.path.join(downloads_dir, file)
-            # Get file modification time
-            mod_time = os.path.getmtime(file_path)
-            # Create a readable time string
-            time_str = datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M:%S")
-            dk_files.append((file_path, mod_time, time_str))
+    with os.scandir(downloads_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith("DKSalaries") and entry.name.endswith(".csv") and entry.is_file():
+                # Get file modification time
+                mod_time = entry.stat().st_mtime
+                # Create a readable time string
+                time_str = datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M:%S")
+                dk_files.append((entry.path, mod_time, time_str))
     
     # Sort files by modification time (newest first)
     dk_files.sort(key=lambda x: x[1], reverse=True)
@@ -66,21 +99,24 @@ def main():
         else:
             print(f"\nUsing the most recent file: {os.path.basename(dk_files[0][0])}")
     
-    # Get the selected file
-    dk_file = dk_files[file_index][0]
+    # Get the selected file and its modification date and time
+    dk_file, _, mod_time_str = dk_files[file_index]
     
     if not dk_file:
         print("Could not find any DraftKings salary files in your Downloads folder.")
         print("Please download the file or place it manually in this directory.")
         return
     
-    # Get the file's modification date and time
-    mod_time = datetime.fromtimestamp(os.path.getmtime(dk_file))
-    mod_time_str = mod_time.strftime("%Y-%m-%d %H:%M:%S")
-    
     # Copy the file to the current directory
     dest_file = os.path.join(os.getcwd(), "DKSalaries.csv")
     try:
+        if is_same_file_content(dk_file, dest_file):
+            print(f"DraftKings file is already up to date, skipping the copy:")
+            print(f"  Source: {dk_file}")
+            print(f"  Last modified: {mod_time_str}")
+            print(f"  Destination: {dest_file}")
+            return
+        
         shutil.copy2(dk_file, dest_file)
         print(f"Successfully copied the latest DraftKings file:")
         print(f"  Source: {dk_file}")
@@ -10,9 +10,10 @@ It provides utilities to:
 """
 
 import os
+import re
 import sys
+import fnmatch
 import pandas as pd
-import glob
 from datetime import datetime
 import shutil
 import requests
@@ -26,66 +27,105 @@ except ImportError:
     sys.exit(1)
 
 
-def list_all_injury_files():
-    """Find and list all potential injury files."""
-    # Look for common injury file patterns
-    injury_patterns = ["mlb-injury*.csv", "*injury*.csv", "*injured*.csv", "*-IL-*.csv"]
-    
-    # Define search directories in priority order
+# Common injury file patterns, combined into one regular expression
+# (matched against os.path.normcase'd names, like glob does)
+INJURY_PATTERNS = ["mlb-injury*.csv", "*injury*.csv", "*injured*.csv", "*-IL-*.csv"]
+_INJURY_FILE_RE = re.compile('|'.join(fnmatch.translate(os.path.normcase(pattern))
+                                      for pattern in INJURY_PATTERNS))
+
+
+def _injury_search_dirs():
+    """Return the directories to search for injury files, in priority order."""
     current_dir = os.getcwd()
     parent_dir = os.path.dirname(current_dir)
     user_downloads = os.path.join(os.path.expanduser("~"), "Downloads")
     
-    search_dirs = [
+    return [
         current_dir,                       # Current directory (MLB_Optimizer)
         parent_dir,                        # Parent directory (roster_opt)
         user_downloads,                    # User's Downloads folder
         os.path.join(parent_dir, "data"),  # Possible data directory
     ]
-    
+
+
+def _search_dirs_stamp():
+    """Return the modification times of the search directories, to tell when a file list is stale."""
+    stamp = []
+    for directory in _injury_search_dirs():
+        try:
+            stamp.append((directory, os.stat(directory).st_mtime_ns))
+        except OSError:
+            stamp.append((directory, None))
+    return tuple(stamp)
+
+
+def list_all_injury_files():
+    """Find and list all potential injury files."""
     all_matches = []
+    seen = set()
     
-    # Find all matching files across directories
-    for directory in search_dirs:
-        if os.path.exists(directory):
-            for pattern in injury_patterns:
-                full_pattern = os.path.join(directory, pattern)
-                matches = glob.glob(full_pattern)
-                if matches:
-                    for match in matches:
-                        # Get file size and modified time
-                        size = os.path.getsize(match)
-                        mtime = os.path.getmtime(match)
-                        mtime_str = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
-                        all_matches.append((match, size, mtime, mtime_str))
+    # Find all matching files across directories, reading each directory once
+    for directory in _injury_search_dirs():
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Like glob, '*' patterns skip hidden files
+                    if entry.name.startswith('.') or not _INJURY_FILE_RE.match(os.path.normcase(entry.name)):
+                        continue
+                    if entry.path in seen or not entry.is_file():
+                        continue
+                    seen.add(entry.path)
+                    
+                    # Get file size and modified time
+                    st = entry.stat()
+                    mtime_str = datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+                    all_matches.append((entry.path, st.st_size, st.st_mtime, mtime_str))
+        except OSError:
+            # Directory doesn't exist or can't be read
+            continue
     
     # Sort by modification time (newest first)
     all_matches.sort(key=lambda x: x[2], reverse=True)
     return all_matches
 
 
+def _cached_injury_files(files, stamp):
+    """Return the cached injury file list and its stamp, searching again if a search directory changed."""
+    current_stamp = _search_dirs_stamp()
+    if files is None or stamp != current_stamp:
+        files = list_all_injury_files()
+    return files, current_stamp
+
+
 def preview_injury_file(file_path):
     """Preview the contents of an injury file."""
     try:
-        df = pd.read_csv(file_path)
+        # Read only the header first; the rows are read as needed below
+        columns = pd.read_csv(file_path, nrows=0).columns.tolist()
         
+        # Try to identify the player name column
+        name_columns = [col for col in columns if any(keyword in col.lower() for keyword in ['name', 'player'])]
+        
+        # Count the rows by parsing a single column rather than the whole file
+        num_rows = len(pd.read_csv(file_path, usecols=[name_columns[0] if name_columns else 0], dtype=str))
+        
+        stat = os.stat(file_path)
         print(f"\nPreview of: {file_path}")
-        print(f"File size: {os.path.getsize(file_path)} bytes")
-        print(f"Last modified: {datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Number of rows: {len(df)}")
-        print(f"Columns: {', '.join(df.columns)}")
+        print(f"File size: {stat.st_size} bytes")
+        print(f"Last modified: {datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Number of rows: {num_rows}")
+        print(f"Columns: {', '.join(columns)}")
         
-        # Try to identify the player name column
-        name_columns = [col for col in df.columns if any(keyword in col.lower() for keyword in ['name', 'player'])]
         if name_columns:
             name_col = name_columns[0]
             print(f"\nPreview of '{name_col}' column (first 10 entries):")
-            for idx, name in enumerate(df[name_col].head(10).values):
+            names = pd.read_csv(file_path, usecols=[name_col], nrows=10)[name_col]
+            for idx, name in enumerate(names.values):
                 print(f"  {idx+1}. {name}")
         else:
             print("\nCouldn't identify player name column.")
             print("First 5 rows:")
-            print(df.head())
+            print(pd.read_csv(file_path, nrows=5))
     except Exception as e:
         print(f"Error reading the file: {str(e)}")
 
@@ -127,6 +167,9 @@ def main():
     print("\nMLB Injury File Manager")
     print("======================")
     
+    # Injury files from the last search, reused while the search directories are unchanged
+    files, files_stamp = None, None
+    
     while True:
         print("\nOptions:")
         print("1. Find most recent injury file")
@@ -148,7 +191,7 @@ def main():
         
         elif choice == '2':
             print("\nSearching for all injury files...")
-            files = list_all_injury_files()
+            files, files_stamp = list_all_injury_files(), _search_dirs_stamp()
             if files:
                 print(f"\nFound {len(files)} potential injury files:")
                 for i, (path, size, mtime, mtime_str) in enumerate(files, 1):
@@ -159,7 +202,7 @@ def main():
                 print("\nNo injury files found.")
         
         elif choice == '3':
-            files = list_all_injury_files()
+            files, files_stamp = _cached_injury_files(files, files_stamp)
             if not files:
                 print("\nNo injury files found.")
                 continue
@@ -180,7 +223,7 @@ def main():
                 print("Please enter a valid number.")
         
         elif choice == '4':
-            files = list_all_injury_files()
+            files, files_stamp = _cached_injury_files(files, files_stamp)
             if not files:
                 print("\nNo injury files found to copy.")
                 continue
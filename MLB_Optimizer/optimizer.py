@@ -9,23 +9,91 @@ salary constraints.
 
 import os
 import csv
+import functools
+import shutil
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+import numpy as np
 import pandas as pd
 import pulp as plp
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+try:
+    import pyarrow  # noqa: F401 (optional; lets pandas use its multithreaded CSV reader)
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+# Columns read from the player CSV and their types; the parser converts them directly.
+# Repeated strings are stored as categories.
+PLAYER_COLUMNS = {
+    'ID': 'int64',
+    'Name': 'category',
+    'Roster Position': 'category',
+    'TeamAbbrev': 'category',
+    'Game Info': 'category',
+    'Salary': 'int64',
+    'AvgPointsPerGame': 'float64',
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_players_cached(csv_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Read a player CSV, caching the result per file version.
+    
+    The modification time and size are part of the cache key, so an edited file is read again.
+    
+    Args:
+        csv_path: Path to the CSV file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+        
+    Returns:
+        DataFrame with the player data and each player's opponent (shared; copy before modifying)
+    """
+    # Only the columns used for the optimization are read, already converted to their types
+    df = pd.read_csv(csv_path, usecols=list(PLAYER_COLUMNS), dtype=PLAYER_COLUMNS, engine=CSV_ENGINE)
+    
+    # Each player's opponent, parsed once from the "TEAM1@TEAM2 ..." game information
+    game_info = df['Game Info'].astype(str)
+    teams = game_info.str.split(' ', n=1).str[0].str.split('@')
+    first_team, second_team = teams.str[0], teams.str[1]
+    df['Opponent'] = np.where(first_team == df['TeamAbbrev'].astype(str), second_team, first_team)
+    df.loc[~game_info.str.contains('@', regex=False), 'Opponent'] = "Unknown"
+    return df
 
 
 class LineupOptimizer:
     """Class to handle the optimization of Daily Fantasy Baseball lineups."""
 
-    def __init__(self, csv_path: str, salary_cap: int = 50000):
+    # Order in which positions are listed in a lineup
+    _POSITION_ORDER = {'P': 0, 'C': 1, '1B': 2, '2B': 3, '3B': 4, 'SS': 5, 'OF': 6}
+
+    def __init__(
+        self, 
+        csv_path: str, 
+        salary_cap: int = 50000,
+        solver_name: str = 'HiGHS',
+        gap_rel: Optional[float] = None,
+        time_limit: Optional[int] = None
+    ):
         """
         Initialize the lineup optimizer with player data and constraints.
         
         Args:
             csv_path: Path to the CSV file containing player data
             salary_cap: Maximum salary allowed for the roster (default: $50,000)
+            solver_name: MIP solver to use ('HiGHS' or 'CBC'); falls back to CBC if HiGHS is unavailable
+            gap_rel: Optional relative MIP gap at which a lineup is accepted (e.g. 1e-4)
+            time_limit: Optional time limit in seconds for each lineup solve
         """
         self.salary_cap = salary_cap
+        self.solver_name = solver_name
+        self.gap_rel = gap_rel
+        self.time_limit = time_limit
         self.players_df = self._load_data(csv_path)
         self.required_positions = {
             'P': 2,
@@ -36,6 +104,22 @@ class LineupOptimizer:
             'SS': 1,
             'OF': 3
         }
+        
+        # Player attributes as NumPy arrays, extracted once for building the model
+        # instead of iterating over the DataFrame rows
+        self._ids = self.players_df['ID'].to_numpy()
+        self._salaries = self.players_df['Salary'].to_numpy()
+        self._points = self.players_df['AvgPointsPerGame'].to_numpy()
+        self._positions = self.players_df['Roster Position'].to_numpy()
+        self._names = self.players_df['Name'].to_numpy()
+        self._teams = self.players_df['TeamAbbrev'].to_numpy()
+        self._opponents = self.players_df['Opponent'].to_numpy()
+        self._position_rank = (self.players_df['Roster Position'].map(self._POSITION_ORDER)
+                               .fillna(len(self._POSITION_ORDER)).to_numpy(dtype=np.int64))
+        
+        # Row indices of the players eligible for each required position
+        self._pos_to_indices = {position: np.flatnonzero(self._positions == position)
+                                for position in self.required_positions}
 
     def _load_data(self, csv_path: str) -> pd.DataFrame:
         """
@@ -47,12 +131,63 @@ class LineupOptimizer:
         Returns:
             DataFrame containing player information
         """
-        df = pd.read_csv(csv_path)
-        # Ensure we use the Roster Position for our optimization
-        # and that the data types are correct
-        df['Salary'] = df['Salary'].astype(int)
-        df['AvgPointsPerGame'] = df['AvgPointsPerGame'].astype(float)
-        return df
+        stat = os.stat(csv_path)
+        return _read_players_cached(os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size).copy()
+
+    def _make_solver(self, threads: Optional[int] = None) -> plp.LpSolver:
+        """
+        Create the solver used for each lineup solve.
+        
+        Prefers the HiGHS command-line solver and falls back to the CBC solver bundled
+        with PuLP when HiGHS isn't installed. Both run their branch and bound on several
+        threads.
+        
+        Args:
+            threads: Number of solver threads (default: all CPUs but one)
+        
+        Returns:
+            A configured PuLP solver instance
+        """
+        if threads is None:
+            threads = max(1, (os.cpu_count() or 1) - 1)
+        
+        if self.solver_name.lower() == 'highs':
+            solver = plp.HiGHS_CMD(msg=False, timeLimit=self.time_limit, gapRel=self.gap_rel, threads=threads)
+            if solver.available():
+                return solver
+        
+        return plp.PULP_CBC_CMD(msg=False, timeLimit=self.time_limit, gapRel=self.gap_rel, threads=threads)
+
+    def _candidate_indices(self, num_lineups: int) -> np.ndarray:
+        """
+        Find the players that need to be in the model.
+        
+        A player is dominated by another player at the same position with at least as many
+        points and at most the same salary. If a lineup uses a player dominated by
+        count * num_lineups others (count being the slots at that position), one of them can
+        take its place without lowering the points, going over the cap or breaking a
+        uniqueness cut, so those players are left out. So are players whose position isn't
+        part of the roster.
+        
+        Args:
+            num_lineups: Number of lineups that will be generated
+            
+        Returns:
+            Sorted row indices of the remaining players
+        """
+        keep = []
+        for position, count in self.required_positions.items():
+            idx = self._pos_to_indices[position]
+            points = self._points[idx]
+            salaries = self._salaries[idx]
+            
+            # dominated_by[i, j]: player j dominates player i (identical players by row order)
+            better = (points[None, :] >= points[:, None]) & (salaries[None, :] <= salaries[:, None])
+            same = (points[None, :] == points[:, None]) & (salaries[None, :] == salaries[:, None])
+            dominated_by = better & (~same | (idx[None, :] < idx[:, None]))
+            keep.append(idx[dominated_by.sum(axis=1) < count * num_lineups])
+        
+        return np.sort(np.concatenate(keep))
 
     def optimize(self, num_lineups: int = 10) -> List[Dict]:
         """
@@ -66,51 +201,54 @@ class LineupOptimizer:
         """
         lineups = []
         
-        # Create a list to store previously used player combinations
-        previous_lineups_players = []
+        # Build the model once; only the uniqueness cuts change between lineups
+        prob = plp.LpProblem("DFS_Lineup", plp.LpMaximize)
+        
+        # Leave out the players that never need to be considered
+        candidates = self._candidate_indices(num_lineups)
+        
+        # Create a binary variable for each candidate (in row order, so they line up with the arrays)
+        vars_arr = [plp.LpVariable(f"player_{player_id}", cat='Binary') for player_id in self._ids[candidates].tolist()]
+        
+        # Objective function: Maximize total average points
+        prob += plp.LpAffineExpression(zip(vars_arr, self._points[candidates].tolist()))
+        
+        # Constraint 1: Salary cap
+        prob += plp.LpAffineExpression(zip(vars_arr, self._salaries[candidates].tolist())) <= self.salary_cap
+        
+        # Constraint 2: Position requirements
+        # (the candidates' variables are grouped by position in a single pass)
+        pos_groups = defaultdict(list)
+        for var, position in zip(vars_arr, self._positions[candidates].tolist()):
+            pos_groups[position].append(var)
+        for position, count in self.required_positions.items():
+            prob += plp.lpSum(pos_groups[position]) == count
+        
+        # Constraint 3: Exactly 10 players in total
+        prob += plp.lpSum(vars_arr) == sum(self.required_positions.values())
+        
+        # One solver for all the lineups
+        solver = self._make_solver()
         
         for i in range(num_lineups):
-            # Create a new linear programming problem
-            prob = plp.LpProblem(f"DFS_Lineup_{i+1}", plp.LpMaximize)
-            
-            # Create a binary variable for each player
-            player_vars = {row['ID']: plp.LpVariable(f"player_{row['ID']}", cat='Binary') 
-                           for _, row in self.players_df.iterrows()}
-            
-            # Objective function: Maximize total average points
-            prob += plp.lpSum(row['AvgPointsPerGame'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows())
-            
-            # Constraint 1: Salary cap
-            prob += plp.lpSum(row['Salary'] * player_vars[row['ID']] 
-                             for _, row in self.players_df.iterrows()) <= self.salary_cap
-            
-            # Constraint 2: Position requirements
-            for position, count in self.required_positions.items():
-                prob += plp.lpSum(player_vars[row['ID']] 
-                                 for _, row in self.players_df.iterrows() 
-                                 if row['Roster Position'] == position) == count
-            
-            # Constraint 3: Exactly 10 players in total
-            prob += plp.lpSum(player_vars.values()) == sum(self.required_positions.values())
-            
-            # Constraint 4: Ensure uniqueness from previous lineups
-            for prev_lineup in previous_lineups_players:
-                # Add constraint that the new lineup must differ from each previous lineup by at least 3 players
-                prob += plp.lpSum(player_vars[player_id] for player_id in prev_lineup) <= len(prev_lineup) - 3
-            
             # Solve the problem
-            prob.solve(plp.PULP_CBC_CMD(msg=False))
+            prob.solve(solver)
             
             # Check if a solution was found
             if plp.LpStatus[prob.status] != 'Optimal':
                 print(f"Could not find optimal solution for lineup {i+1}")
-                continue
+                # The model only changes when a lineup is found, so later solves would fail too
+                break
                 
             # Extract the selected players
-            selected_player_ids = [int(p_id) for p_id, var in player_vars.items() 
-                                 if plp.value(var) == 1]
-            previous_lineups_players.append(selected_player_ids)
+            # (threshold the solution values, which can be off by the solver's tolerance)
+            solution = np.fromiter((var.varValue for var in vars_arr), dtype=np.float32, count=len(vars_arr))
+            selected_vars = np.flatnonzero(solution > 0.5)
+            selected_idx = candidates[selected_vars].astype(np.int32)
+            
+            # Constraint 4: Ensure uniqueness from previous lineups
+            # Next lineup must differ from this one by at least 3 players
+            prob += plp.LpAffineExpression((vars_arr[idx], 1) for idx in selected_vars.tolist()) <= len(selected_vars) - 3
             
             # Create lineup data
             lineup_data = {
@@ -119,23 +257,23 @@ class LineupOptimizer:
                 'total_points': 0
             }
             
-            for player_id in selected_player_ids:
-                player = self.players_df[self.players_df['ID'] == player_id].iloc[0]
+            # Sort the selected players by position in the required order, then by points
+            # (highest first), in one stable sort over the cached arrays
+            order = np.lexsort((-self._points[selected_idx], self._position_rank[selected_idx]))
+            
+            # Read the selected players' details by row from the cached arrays
+            for idx in selected_idx[order].tolist():
                 lineup_data['players'].append({
-                    'id': player['ID'],
-                    'name': player['Name'],
-                    'position': player['Roster Position'],
-                    'team': player['TeamAbbrev'],
-                    'opponent': self._extract_opponent(player['Game Info'], player['TeamAbbrev']),
-                    'salary': player['Salary'],
-                    'avg_points': player['AvgPointsPerGame']
+                    'id': self._ids[idx],
+                    'name': self._names[idx],
+                    'position': self._positions[idx],
+                    'team': self._teams[idx],
+                    'opponent': self._opponents[idx],
+                    'salary': self._salaries[idx],
+                    'avg_points': self._points[idx]
                 })
-                lineup_data['total_salary'] += player['Salary']
-                lineup_data['total_points'] += player['AvgPointsPerGame']
-            
-            # Sort players by position in the required order
-            position_order = {'P': 0, 'C': 1, '1B': 2, '2B': 3, '3B': 4, 'SS': 5, 'OF': 6}
-            lineup_data['players'].sort(key=lambda x: (position_order[x['position']], -x['avg_points']))
+                lineup_data['total_salary'] += self._salaries[idx]
+                lineup_data['total_points'] += self._points[idx]
             
             lineups.append(lineup_data)
         
@@ -218,45 +356,29 @@ class LineupOptimizer:
         # Define the positions in the order they should appear in the CSV
         positions = ['P', 'P', 'C', '1B', '2B', '3B', 'SS', 'OF', 'OF', 'OF']
         
+        # Build one roster row per lineup
+        roster_rows = []
+        for lineup in lineups:
+            # Sort the lineup once by position order, then by average points (highest first)
+            ranked = sorted((player for player in lineup['players'] if player['position'] in self._POSITION_ORDER),
+                            key=lambda x: (self._POSITION_ORDER[x['position']], -x['avg_points']))
+            
+            # Each position is now a consecutive run of player IDs
+            runs = {pos: iter([str(player['id']) for player in group])
+                    for pos, group in groupby(ranked, key=itemgetter('position'))}
+            
+            # Fill the slots in order from each position's run
+            # (an empty slot shouldn't happen in a valid lineup)
+            roster_row = [next(runs.get(pos, iter(())), '') for pos in positions]
+            
+            roster_rows.append(roster_row)
+        
         with open(output_path, 'w', newline='') as csvfile:
             csvwriter = csv.writer(csvfile)
             
             # Write the header row
             csvwriter.writerow(positions)
-            
-            # Process each lineup
-            for lineup in lineups:
-                # Create a dictionary to organize players by position
-                players_by_position = {pos: [] for pos in positions}
-                
-                # Sort players into their positions
-                for player in lineup['players']:
-                    pos = player['position']
-                    if pos in players_by_position:
-                        # Get player ID (already stored in player data)
-                        player_data = {
-                            'id': player['id'],
-                            'avg_points': player['avg_points']
-                        }
-                        players_by_position[pos].append(player_data)
-                
-                # Sort players by average points within each position
-                for pos in players_by_position:
-                    if len(players_by_position[pos]) > 0:
-                        players_by_position[pos].sort(key=lambda x: x['avg_points'], reverse=True)
-                
-                # Build the roster row with IDs in the correct position order
-                roster_row = []
-                for pos in positions:
-                    if players_by_position[pos] and len(players_by_position[pos]) > 0:
-                        # Take the highest-scoring player for this position
-                        roster_row.append(str(players_by_position[pos].pop(0)['id']))
-                    else:
-                        # If no player found for this position (shouldn't happen in a valid lineup)
-                        roster_row.append('')
-                
-                # Write the roster row
-                csvwriter.writerow(roster_row)
+            csvwriter.writerows(roster_rows)
         
         print(f"\nLineups saved to {output_path} in position-based format")
 
@@ -324,38 +446,19 @@ def main():
             timestamped_name = f"{name_parts[0]}_{timestamp}{name_parts[1]}"
             output_path = os.path.join(output_dir, timestamped_name)
             
-            with open(output_path, 'w', newline='') as csvfile:
-                csvwriter = csv.writer(csvfile)
-                csvwriter.writerow(['Lineup', 'Position', 'Name', 'Team', 'Opponent', 'Salary', 'Avg Points'])
-                
-                for i, lineup in enumerate(lineups, 1):
-                    for player in lineup['players']:
-                        csvwriter.writerow([
-                            i, 
-                            player['position'], 
-                            player['name'], 
-                            player['team'],
-                            player['opponent'],
-                            player['salary'], 
-                            player['avg_points']
-                        ])
+            rows = [
+                (i, player['position'], player['name'], player['team'], player['opponent'],
+                 player['salary'], player['avg_points'])
+                for i, lineup in enumerate(lineups, 1)
+                for player in lineup['players']
+            ]
+            columns = ['Lineup', 'Position', 'Name', 'Team', 'Opponent', 'Salary', 'Avg Points']
+            
+            # CRLF line endings, as csv.writer produced
+            pd.DataFrame.from_records(rows, columns=columns).to_csv(output_path, index=False, lineterminator='\r\n')
             
             # Also save to the standard filename in the base directory for compatibility
-            with open(output_file, 'w', newline='') as csvfile:
-                csvwriter = csv.writer(csvfile)
-                csvwriter.writerow(['Lineup', 'Position', 'Name', 'Team', 'Opponent', 'Salary', 'Avg Points'])
-                
-                for i, lineup in enumerate(lineups, 1):
-                    for player in lineup['players']:
-                        csvwriter.writerow([
-                            i, 
-                            player['position'], 
-                            player['name'], 
-                            player['team'],
-                            player['opponent'],
-                            player['salary'], 
-                            player['avg_points']
-                        ])
+            shutil.copy2(output_path, output_file)
             
             print(f"\nDetailed lineups saved to {output_path}")
             
@@ -8,6 +8,12 @@ import sys
 import subprocess
 import os
 
+# Run the optimizer in this interpreter when it can be imported
+try:
+    import advanced_optimizer
+except ImportError:
+    advanced_optimizer = None
+
 def run_optimizer():
     """Run the optimizer with validated parameters."""
     # Get command-line arguments
@@ -36,8 +42,11 @@ def run_optimizer():
     cmd = ['python', 'advanced_optimizer.py'] + args
     print("Running optimizer with arguments:", ' '.join(cmd[1:]))
     
-    # Run the optimizer
-    subprocess.run(cmd)
+    # Run the optimizer, starting a new interpreter only if it couldn't be imported
+    if advanced_optimizer is not None:
+        advanced_optimizer.main(args)
+    else:
+        subprocess.run(cmd)
 
 if __name__ == '__main__':
     run_optimizer()
@@ -103,6 +103,20 @@ class TestAdvancedLineupOptimizer(unittest.TestCase):
         self.assertEqual(opponents_dict.get('BOS'), 'NYY')
         self.assertEqual(opponents_dict.get('LAD'), 'CHC')
         self.assertEqual(opponents_dict.get('CHC'), 'LAD')
+        
+        # The mapping is extracted once when the optimizer is created
+        self.assertEqual(self.optimizer.opponents_dict, opponents_dict)
+
+    def test_symmetric_groups(self):
+        """Test grouping interchangeable players for symmetry breaking."""
+        groups = [sorted(self.optimizer._ids[indices].tolist()) for indices in self.optimizer._symmetric_groups]
+        
+        # Outfielders 20 and 25 share team, salary and points
+        self.assertIn([20, 25], groups)
+        
+        # Players at different positions are never grouped together
+        for indices in self.optimizer._symmetric_groups:
+            self.assertEqual(len(set(self.optimizer._positions[indices])), 1)
 
     def test_optimize_basic_functionality(self):
         """Test basic optimization functionality."""
@@ -227,6 +241,62 @@ class TestAdvancedLineupOptimizer(unittest.TestCase):
                 # There should be at most 10 - diversity common players
                 self.assertLessEqual(len(common_players), 10 - diversity)
 
+    def test_perturbed_lineup_diversity(self):
+        """Test that lineups from perturbed projections still meet the diversity requirement."""
+        num_lineups = 4
+        diversity = 2
+        
+        # Raise the salary cap so the sample players can fill several lineups
+        optimizer = AdvancedLineupOptimizer(self.test_csv_path, salary_cap=100000)
+        lineups = optimizer.optimize(
+            num_lineups=num_lineups,
+            min_salary_used=0,
+            lineup_diversity=diversity,
+            perturbation=0.1,
+            random_seed=0
+        )
+        
+        self.assertEqual(len(lineups), num_lineups)
+        
+        # Lineups are still reported by their actual points, best first
+        total_points = [lineup['total_points'] for lineup in lineups]
+        self.assertEqual(total_points, sorted(total_points, reverse=True))
+        
+        lineup_ids = [{player['id'] for player in lineup['players']} for lineup in lineups]
+        for i in range(num_lineups):
+            for j in range(i + 1, num_lineups):
+                self.assertLessEqual(len(lineup_ids[i] & lineup_ids[j]), 10 - diversity)
+
+    def test_tied_players_with_diversity(self):
+        """Test symmetry breaking and lazy uniqueness cuts on players with tied projections."""
+        num_lineups = 4
+        diversity = 3
+        options = dict(num_lineups=num_lineups, min_salary_used=0, lineup_diversity=diversity)
+        
+        # The sample data repeats every 5 rows, so most positions have tied players
+        optimizer = AdvancedLineupOptimizer(self.test_csv_path, salary_cap=100000)
+        self.assertTrue(optimizer._symmetric_groups)
+        
+        # The symmetry rows don't change the lineups found with the actual projections
+        with_symmetry = optimizer.optimize(**options)
+        with patch.object(optimizer, '_symmetric_groups', []):
+            without_symmetry = optimizer.optimize(**options)
+        self.assertEqual(len(with_symmetry), len(without_symmetry))
+        for lineup, expected in zip(with_symmetry, without_symmetry):
+            self.assertAlmostEqual(lineup['total_points'], expected['total_points'])
+        
+        # Perturbed projections make tied players differ, so the model gets no symmetry rows
+        with patch.object(optimizer, '_build_base_model', wraps=optimizer._build_base_model) as build_model:
+            perturbed = optimizer.optimize(perturbation=0.1, random_seed=1, **options)
+        self.assertFalse(build_model.call_args.kwargs['break_symmetry'])
+        
+        for lineups in (with_symmetry, perturbed):
+            self.assertEqual(len(lineups), num_lineups)
+            lineup_ids = [{player['id'] for player in lineup['players']} for lineup in lineups]
+            for i in range(num_lineups):
+                for j in range(i + 1, num_lineups):
+                    self.assertLessEqual(len(lineup_ids[i] & lineup_ids[j]), 10 - diversity)
+
     def test_min_salary_used_constraint(self):
         """Test minimum salary used constraint."""
         min_salary_pct = 0.95
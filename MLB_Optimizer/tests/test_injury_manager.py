@@ -9,6 +9,7 @@ file formats.
 
 import os
 import sys
+import tempfile
 import unittest
 import pandas as pd
 from unittest.mock import patch, MagicMock
@@ -42,34 +43,27 @@ class TestInjuryManager(unittest.TestCase):
 
     def test_list_all_injury_files(self):
         """Test finding all injury files."""
-        with patch('os.getcwd') as mock_getcwd, \
-             patch('os.path.dirname') as mock_dirname, \
-             patch('os.path.expanduser') as mock_expanduser, \
-             patch('os.path.exists') as mock_exists, \
-             patch('glob.glob') as mock_glob, \
-             patch('os.path.getsize') as mock_getsize, \
-             patch('os.path.getmtime') as mock_getmtime:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current_dir = os.path.join(temp_dir, 'current')
+            os.makedirs(current_dir)
             
-            # Set up the mocks
-            mock_getcwd.return_value = '/test/current'
-            mock_dirname.return_value = '/test'
-            mock_expanduser.return_value = '/home/user'
-            mock_exists.return_value = True
+            # One file matching several patterns, one other match and one non-match
+            injury_file = os.path.join(current_dir, 'mlb-injury-report.csv')
+            self.test_injury_data.to_csv(injury_file, index=False)
+            other_file = os.path.join(temp_dir, 'players-IL-list.csv')
+            self.test_injury_data.to_csv(other_file, index=False)
+            with open(os.path.join(current_dir, 'DKSalaries.csv'), 'w') as f:
+                f.write('ID\n')
+            os.utime(other_file, (1593532800.0, 1593532800.0))  # July 1, 2020
             
-            # Mock glob to return our test file
-            mock_glob.return_value = [self.test_injury_path]
+            with patch('os.getcwd', return_value=current_dir), \
+                 patch('os.path.expanduser', return_value=os.path.join(temp_dir, 'home')):
+                result = list_all_injury_files()
             
-            # Mock file stats
-            mock_getsize.return_value = 1024
-            mock_getmtime.return_value = 1593532800.0  # July 1, 2020
-            
-            # Call the function
-            result = list_all_injury_files()
-            
-            # Check that it found our test file
-            self.assertGreaterEqual(len(result), 1)  # Updated to handle variable number of injury files
-            self.assertEqual(result[0][0], self.test_injury_path)
-            self.assertEqual(result[0][1], 1024)  # Size
+            # Each matching file is listed once, newest first
+            self.assertEqual([path for path, _, _, _ in result], [injury_file, other_file])
+            self.assertEqual(result[0][1], os.path.getsize(injury_file))  # Size
+            self.assertEqual(result[1][2], 1593532800.0)  # Modified time
 
     @patch('builtins.print')
     def test_preview_injury_file(self, mock_print):
@@ -66,6 +66,21 @@ class TestLineupOptimizer(unittest.TestCase):
         self.assertEqual(self.optimizer.players_df['Salary'].dtype, np.int64)
         self.assertEqual(self.optimizer.players_df['AvgPointsPerGame'].dtype, np.float64)
 
+    def test_data_loading_cache(self):
+        """Test that cached CSV data is not shared between optimizers."""
+        other_optimizer = LineupOptimizer(self.test_csv_path)
+        other_optimizer.players_df.loc[0, 'Salary'] = 1
+
+        self.assertEqual(self.optimizer.players_df.loc[0, 'Salary'], 5000)
+        self.assertEqual(LineupOptimizer(self.test_csv_path).players_df.loc[0, 'Salary'], 5000)
+
+    def test_opponent_column(self):
+        """Test that the Opponent column computed at load time matches _extract_opponent."""
+        df = self.optimizer.players_df
+        expected = [self.optimizer._extract_opponent(game, team)
+                    for game, team in zip(df['Game Info'].astype(str), df['TeamAbbrev'].astype(str))]
+        self.assertEqual(df['Opponent'].tolist(), expected)
+
     def test_optimize_single_lineup(self):
         """Test generating a single optimized lineup."""
         lineups = self.optimizer.optimize(num_lineups=1)
@@ -109,6 +124,16 @@ class TestLineupOptimizer(unittest.TestCase):
                     position_order[lineup['players'][i+1]['position']]
                 )
 
+    def test_candidate_indices(self):
+        """Test that dominated players are left out of the model only when it's safe."""
+        # Player 8 (1B, 9.8 points, $6000) is dominated by player 10 (1B, 10.5 points, $5000)
+        candidates = self.optimizer._candidate_indices(1)
+        self.assertNotIn(8, candidates)
+        self.assertIn(10, candidates)
+
+        # With more lineups, the dominated players may be needed for the uniqueness cuts
+        self.assertEqual(self.optimizer._candidate_indices(10).tolist(), list(range(30)))
+
     def test_multiple_lineups_diversity(self):
         """Test generating multiple lineups with diversity."""
         num_lineups = 3
@@ -155,10 +180,13 @@ class TestLineupOptimizer(unittest.TestCase):
             mock_status = MagicMock()
             mock_status.__getitem__.return_value = 'Infeasible'
             with patch('pulp.LpStatus', mock_status):
-                lineups = low_cap_optimizer.optimize(num_lineups=1)
+                lineups = low_cap_optimizer.optimize(num_lineups=3)
                 
                 # Should get an empty list if no solution is found
                 self.assertEqual(lineups, [])
+                
+                # The failed model isn't solved again for the remaining lineups
+                mock_solve.assert_called_once()
 
 
 if __name__ == '__main__':